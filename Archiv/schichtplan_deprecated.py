@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import re
 from datetime import datetime, timedelta, time
@@ -251,8 +252,11 @@ df_both_locations.to_csv("Schichtplan/both_locations.csv", index=False)
 df_alt.to_csv("Schichtplan/schedule_ALT.csv", index=False)
 df_wie.to_csv("Schichtplan/schedule_WIE.csv", index=False)
 
-# Show the parsed DataFrame
-printall(df[['new_name', 'Start Time', 'End Time']])
+# Show the parsed DataFrame (full render is slow on large months)
+if os.getenv("SCHICHTPLAN_DEBUG") == "1":
+    printall(df[['new_name', 'Start Time', 'End Time']])
+else:
+    print(f"{len(df)} Schichten erzeugt.")
 
 
 # Extract names from person_info
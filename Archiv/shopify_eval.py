@@ -1,3 +1,4 @@
+import re
 import requests
 import pandas as pd
 from datetime import datetime, timedelta, UTC
@@ -12,6 +13,7 @@ ACCESS_TOKEN = os.getenv("SHOPIFY_KEY")
 SHOP_NAME = "suedseitecoffee"  # e.g., 'my-store'
 # Shopify API version
 API_VERSION = "2024-01"
+BREAD_TITLE_PATTERN = re.compile("Gutes Brot|Brote für Solawi|Unsere Brote")
 print(ACCESS_TOKEN)
 
 # Endpoint URL
@@ -136,7 +138,13 @@ df.to_excel("shopify_orders.xlsx", index=False)
 
 
 # Filter for specific product titles
-filtered_df = df[df["Product Title"].str.contains("Gutes Brot|Brote für Solawi|Unsere Brote", na=False, regex=True)]
-aggregated_df = filtered_df.groupby(["Product Title", "Variant Title"])["Quantity"].sum().reset_index()
+filtered_df = df[df["Product Title"].fillna("").map(BREAD_TITLE_PATTERN.search).astype(bool)]
+# Categorical keys: groupby works on integer codes instead of hashing the strings
+filtered_df = filtered_df.astype({"Product Title": "category", "Variant Title": "category"})
+aggregated_df = (
+    filtered_df.groupby(["Product Title", "Variant Title"], observed=True, sort=False)["Quantity"]
+    .sum()
+    .reset_index()
+)
 aggregated_df = aggregated_df.sort_values(by="Quantity", ascending=False)
 print(aggregated_df)
@@ -16,7 +16,7 @@ from src.order_prompt_config import (
     load_prompt_config,
     order_field_names,
 )
-from src.structured_extraction import extract_with_repair, get_tools_for_target
+from src.structured_extraction import extract_with_repair, get_response_format_for_target
 
 
 def _stringify(value) -> str:  # type: ignore[no-untyped-def]
@@ -112,13 +112,13 @@ def extract_orders_from_image(
         output_template,
     )
     user_prompt = build_image_user_prompt()
-    tools = get_tools_for_target("orders_v1")
+    response_format = get_response_format_for_target("orders_v1")
     logger.info(
-        "Image extraction prompt ready request_id=%s system_prompt_chars=%s user_prompt_chars=%s tool_count=%s",
+        "Image extraction prompt ready request_id=%s system_prompt_chars=%s user_prompt_chars=%s response_format=%s",
         request_id,
         len(system_prompt),
         len(user_prompt),
-        len(tools),
+        response_format["type"],
     )
 
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
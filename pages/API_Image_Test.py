@@ -11,6 +11,7 @@ from src.notion_access import (
     DEFAULT_ORDER_DB_TITLE,
     build_order_database_properties,
     create_order_database,
+    describe_failed_orders,
     get_database_schema,
     insert_orders,
 )
@@ -20,6 +21,16 @@ try:
 except ImportError:  # pragma: no cover
     requests = None
 
+
+@st.cache_resource(show_spinner=False)
+def _get_http_session():
+    # Shared across reruns and sessions so repeat uploads reuse the keep-alive pool.
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 def _resolve_image_extract_url() -> str:
     base_or_endpoint = os.getenv("API_BASE_URL", "http://localhost:8000").strip()
     if not base_or_endpoint:
@@ -31,19 +42,28 @@ def _resolve_image_extract_url() -> str:
     return f"{base_or_endpoint.rstrip('/')}/api/v1/images/extract"
 
 
-API_URL = _resolve_image_extract_url()
+def _resolve_tls_verify() -> bool | str:
+    raw_value = os.getenv("API_TLS_VERIFY", "true").strip()
+    if raw_value.lower() in {"false", "0", "no", "off"}:
+        return False
+    return raw_value if raw_value not in {"", "true", "1"} else True
+
+
+@st.cache_resource(show_spinner=False)
+def _get_api_config() -> dict:
+    # Environment is read once per process instead of on every widget rerun.
+    return {
+        "url": _resolve_image_extract_url(),
+        "token": os.getenv("API_BEARER_TOKEN", "").strip(),
+        "verify": _resolve_tls_verify(),
+    }
+
+
 REQUEST_TIMEOUT_SECONDS = 30
-API_BEARER_TOKEN = os.getenv("API_BEARER_TOKEN", "").strip()
-API_TLS_VERIFY_RAW = os.getenv("API_TLS_VERIFY", "true").strip()
 DEFAULT_NOTION_PAGE_ID = "3014e28bdf9e802183d3efda2854f233"
 # Fill this once the database exists, to skip re-creating it.
 HARDCODED_NOTION_DATABASE_ID = "3014e28bdf9e812c93e7e970dd3146b1"
 
-if API_TLS_VERIFY_RAW.lower() in {"false", "0", "no", "off"}:
-    API_TLS_VERIFY: bool | str = False
-else:
-    API_TLS_VERIFY = API_TLS_VERIFY_RAW if API_TLS_VERIFY_RAW not in {"", "true", "1"} else True
-
 
 st.title("🧪 API Image Test")
 st.caption(
@@ -94,7 +114,30 @@ def _normalize_orders_for_json(orders: list[dict]) -> list[dict]:
     return normalized
 
 
+def _json_cell(value):
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(microsecond=0).isoformat()
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).isoformat()
+    if isinstance(value, float) and pd.isna(value):
+        return None
+    return value
+
+
+def _editor_orders_for_json(edited_orders: pd.DataFrame) -> list[dict]:
+    # Single pass over the editor frame; avoids to_dict() plus a second normalize loop.
+    columns = list(edited_orders.columns)
+    return [
+        {column: _json_cell(value) for column, value in zip(columns, row)}
+        for row in edited_orders.itertuples(index=False, name=None)
+    ]
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
 def _orders_to_editor_df(orders: list[dict]) -> pd.DataFrame:
+    # Shared, not copied per rerun: callers must not mutate the returned frame.
     df = pd.DataFrame(orders)
     if "Datum" not in df.columns:
         df["Datum"] = pd.NaT
@@ -114,6 +157,10 @@ def _orders_to_rows(orders: list[dict], columns: list[str]) -> list[dict[str, st
     return rows
 
 
+def _default_db_title() -> str:
+    return f"{DEFAULT_ORDER_DB_TITLE} {date.today().strftime('%d.%m.%Y')}"
+
+
 def _expected_order_fields() -> list[str]:
     return [
         "Produkt",
@@ -143,26 +190,28 @@ if send_clicked and uploaded_file is not None and requests is not None:
     }
     data = {"metadata": json.dumps(metadata)}
 
-    st.info(f"Sende Request an: {API_URL}")
+    api_config = _get_api_config()
+    st.info(f"Sende Request an: {api_config['url']}")
     logger.info(
-        "API Image Test: sending image request request_id=%s filename=%s endpoint=%s",
+        "API Image Test: sending image request request_id=%s filename=%s bytes=%s endpoint=%s",
         request_id,
         uploaded_file.name,
-        API_URL,
+        uploaded_file.size,
+        api_config["url"],
     )
     headers = {"X-Request-Id": request_id}
-    if API_BEARER_TOKEN:
-        headers["Authorization"] = f"Bearer {API_BEARER_TOKEN}"
+    if api_config["token"]:
+        headers["Authorization"] = f"Bearer {api_config['token']}"
 
     with st.spinner("API-Aufruf laeuft..."):
         try:
-            response = requests.post(
-                API_URL,
+            response = _get_http_session().post(
+                api_config["url"],
                 headers=headers,
                 files=files,
                 data=data,
                 timeout=REQUEST_TIMEOUT_SECONDS,
-                verify=API_TLS_VERIFY,
+                verify=api_config["verify"],
             )
         except requests.RequestException as exc:
             logger.exception("API Image Test: request failed request_id=%s", request_id)
@@ -224,7 +273,7 @@ if isinstance(current_response, dict):
     with st.expander("JSON Antwort", expanded=False):
         st.json(current_response)
 
-    current_orders = None
+    edited_orders = None
     current_orders_payload = current_response.get("orders")
     if isinstance(current_orders_payload, list) and current_orders_payload:
         st.subheader("✏️ Orders bearbeiten")
@@ -234,10 +283,9 @@ if isinstance(current_response, dict):
             width="stretch",
             key="api_orders_editor",
         )
-        current_orders = edited_orders.to_dict(orient="records")
 
         if st.button("Änderungen übernehmen"):
-            normalized_orders = _normalize_orders_for_json(current_orders)
+            normalized_orders = _editor_orders_for_json(edited_orders)
             st.session_state["api_image_response"]["orders"] = normalized_orders
 
             columns = st.session_state["api_image_response"].get("columns", [])
@@ -247,13 +295,6 @@ if isinstance(current_response, dict):
                 )
             st.success("Änderungen gespeichert.")
 
-    if current_orders is None:
-        current_orders = (
-            current_orders_payload if isinstance(current_orders_payload, list) else []
-        )
-    current_json = dict(st.session_state["api_image_response"])
-    current_json["orders"] = _normalize_orders_for_json(current_orders)
-
     dev_mode = st.checkbox(
         "Dev mode",
         value=st.session_state.get("api_test_dev_mode", False),
@@ -340,10 +381,11 @@ if isinstance(current_response, dict):
                     st.success("Das aktive Notion-Schema enthaelt alle erwarteten Order-Felder.")
 
     if dev_mode:
-        default_title = f"{DEFAULT_ORDER_DB_TITLE} {date.today().strftime('%d.%m.%Y')}"
+        if "api_test_notion_db_title" not in st.session_state:
+            st.session_state["api_test_notion_db_title"] = _default_db_title()
         db_title = st.text_input(
             "Neuer Datenbank-Titel",
-            value=st.session_state.get("api_test_notion_db_title", default_title),
+            value=st.session_state["api_test_notion_db_title"],
         )
         st.session_state["api_test_notion_db_title"] = db_title
 
@@ -366,7 +408,13 @@ if isinstance(current_response, dict):
                         st.error(f"Datenbank-Erstellung fehlgeschlagen: {exc}")
 
     if st.button("Bestellungen in Notion speichern"):
-        orders = current_json.get("orders", [])
+        # Serialize the editor frame only when the export actually needs the records.
+        if edited_orders is not None:
+            orders = _editor_orders_for_json(edited_orders)
+        else:
+            orders = _normalize_orders_for_json(
+                current_orders_payload if isinstance(current_orders_payload, list) else []
+            )
         if not orders:
             st.warning("Keine Bestellungen gefunden.")
         elif not notion_db_id:
@@ -380,8 +428,12 @@ if isinstance(current_response, dict):
                         len(orders),
                         sorted(list(orders[0].keys())) if orders else [],
                     )
-                    count = insert_orders(notion_db_id, orders)
-                    st.success(f"{count} Bestellungen gespeichert.")
+                    result = insert_orders(notion_db_id, orders)
+                    if result.created:
+                        st.success(f"{result.created} Bestellungen gespeichert.")
+                    if result.failed:
+                        logger.error("Notion-Export unvollständig: %s", result.failed)
+                        st.error(describe_failed_orders(orders, result.failed))
                 except Exception as exc:  # noqa: BLE001
                     logger.exception("Notion-Export fehlgeschlagen.")
                     st.error(f"Notion-Export fehlgeschlagen: {exc}")
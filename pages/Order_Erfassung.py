@@ -1,17 +1,25 @@
+import functools
+import hashlib
 import json
 import os
+import shutil
+import subprocess
 import tempfile
-from datetime import date, datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
+from src.app_paths import DATA_DIR
 from src.logging_config import logger
 from src.notion_access import (
     DEFAULT_ORDER_DB_TITLE,
     build_order_database_properties,
     create_order_database,
+    describe_failed_orders,
     insert_orders,
 )
 from src.order_prompt_config import (
@@ -22,14 +30,24 @@ from src.order_prompt_config import (
     default_output_schema,
     field_descriptions_from_model,
     load_prompt_config,
+    order_datum_column,
     output_schema_json_schema,
     save_prompt_config,
 )
-from src.structured_extraction import extract_with_repair, get_tools_for_target
+from src.structured_extraction import extract_with_repair, get_response_format_for_target
 
 DEFAULT_NOTION_PAGE_ID = "3014e28bdf9e802183d3efda2854f233"
 # Fill this once the database exists, to skip re-creating it.
 HARDCODED_NOTION_DATABASE_ID = "3014e28bdf9e812c93e7e970dd3146b1"
+# whisper-1 and the diarize model only return the finished transcript.
+STREAMING_TRANSCRIBE_MODELS = {"gpt-4o-mini-transcribe", "gpt-4o-transcribe"}
+ORDER_JOB_KEY = "order_job"
+ORDER_JOB_POLL_SECONDS = 0.5
+EXTRACTION_CACHE_DIR = DATA_DIR / "order_extraction" / "cache"
+# Cached results hold customer orders: keep them for a day and at most this many.
+EXTRACTION_CACHE_TTL_SECONDS = 24 * 60 * 60
+EXTRACTION_CACHE_MAX_ENTRIES = 64
+OPUS_UPLOAD_ARGS = ["-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "24k", "-f", "ogg"]
 
 st.title("🧾 Bestellungen erfassen")
 
@@ -113,34 +131,179 @@ with st.sidebar:
 
 
 @st.cache_resource(show_spinner=False)
-def _load_whisper(model_name: str):
+def _worker_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=int(os.getenv("MAX_WORKERS", "8")),
+        thread_name_prefix="order-erfassung",
+    )
+
+
+def _start_order_job(label: str, mode: str, task) -> None:
+    """Submit task(progress) to the worker pool and remember it for later reruns.
+
+    Workers must not touch Streamlit elements or session state, so they only write
+    plain values into ``progress``; _order_job_status renders them on the script thread.
+    """
+    progress = {"transcript": "", "orders": []}
+    st.session_state[ORDER_JOB_KEY] = {
+        "label": label,
+        "mode": mode,
+        "progress": progress,
+        "future": _worker_pool().submit(task, progress),
+    }
+
+
+def _show_job_error(exc: BaseException, mode: str) -> None:
+    if isinstance(exc, ModuleNotFoundError):
+        if mode == "Lokal (Whisper)":
+            logger.error("Whisper module missing for local transcription.")
+            st.error(
+                "Whisper ist nicht installiert. Bitte `openai-whisper` installieren, "
+                "z.B. `uv pip install openai-whisper`."
+            )
+        else:
+            logger.error("OpenAI SDK missing for API transcription.")
+            st.error(
+                "OpenAI SDK ist nicht installiert. Bitte `openai` installieren, "
+                "z.B. `uv pip install openai`."
+            )
+        return
+    logger.error("Transkription/Extraktion fehlgeschlagen.", exc_info=exc)
+    st.error(f"Transkription/Extraktion fehlgeschlagen: {exc}")
+
+
+def _order_job_status() -> None:
+    """Show the running job in an st.status box; store its result once the future is done."""
+    job = st.session_state.get(ORDER_JOB_KEY)
+    if job is None:
+        return
+    future = job["future"]
+    if not future.done():
+        progress = job["progress"]
+        with st.status(job["label"], state="running"):
+            if progress["transcript"]:
+                st.text(progress["transcript"])
+            if progress["orders"]:
+                st.dataframe(pd.DataFrame(list(progress["orders"])), width="stretch")
+        return
+
+    st.session_state.pop(ORDER_JOB_KEY, None)
+    exc = future.exception()
+    if exc is not None:
+        st.session_state["order_job_error"] = (exc, job["mode"])
+    else:
+        result = future.result()
+        if result.get("transcript_text"):
+            st.session_state["transcript_text"] = result["transcript_text"]
+        if "orders_json" in result:
+            st.session_state["orders_json"] = result["orders_json"]
+            st.session_state["orders_prompt_payload"] = result["prompt_payload"]
+        elif result.get("extract"):
+            st.session_state["order_job_warning"] = (
+                "Kein Text erkannt. Bitte mit klarer Sprache erneut versuchen."
+            )
+    # Full rerun so transcript, editor and messages render from the stored result.
+    st.rerun()
+
+
+@st.cache_resource(show_spinner=False)
+def _whisper_module():
+    import torch
     import whisper
 
-    return whisper.load_model(model_name)
+    # Several sessions may transcribe at once; keep torch from oversubscribing cores.
+    torch.set_num_threads(int(os.getenv("TORCH_THREADS", "1")))
+    return whisper
+
+
+@st.cache_resource(show_spinner=False)
+def _openai_client_class():
+    from openai import OpenAI
+
+    return OpenAI
+
+
+@st.cache_resource(show_spinner=False)
+def _get_openai_client(api_key: str):
+    return _openai_client_class()(api_key=api_key)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_whisper(model_name: str):
+    return _whisper_module().load_model(model_name)
 
 
 def _transcribe_audio(file_path: Path, model_name: str) -> str:
-    model = _load_whisper(model_name)
-    result = model.transcribe(str(file_path))
+    result = _load_whisper(model_name).transcribe(str(file_path))
     return result.get("text", "").strip()
 
 
-def _transcribe_audio_api(file_path: Path, model_name: str, prompt: str | None) -> str:
-    from openai import OpenAI
-
-    api_key = _get_openai_api_key()
-    if not api_key:
+def _encode_audio_for_upload(wav_bytes: bytes) -> tuple[str, bytes, str]:
+    """Transcode the recording to 16 kHz mono Opus; fall back to WAV without ffmpeg."""
+    wav_upload = ("audio.wav", wav_bytes, "audio/wav")
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return wav_upload
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-loglevel", "error", "-i", "pipe:0", *OPUS_UPLOAD_ARGS, "pipe:1"],
+            input=wav_bytes,
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("Opus-Kodierung fehlgeschlagen, sende WAV: %s", exc)
+        return wav_upload
+    if not result.stdout:
+        return wav_upload
+    logger.info("Audio-Upload als Opus: %s -> %s Bytes", len(wav_bytes), len(result.stdout))
+    return ("audio.ogg", result.stdout, "audio/ogg")
+
+
+def _transcribe_audio_api(
+    client,
+    audio_upload: tuple[str, bytes, str],
+    model_name: str,
+    prompt: str | None,
+    on_delta=None,
+) -> str:
+    if client is None:
         raise RuntimeError(
             "OPENAI_API_KEY nicht gefunden. Bitte in .env oder st.secrets setzen."
         )
-    client = OpenAI(api_key=api_key)
-    kwargs = {"model": model_name, "file": open(file_path, "rb"), "response_format": "text"}
+    kwargs = {"model": model_name, "response_format": "text"}
     if prompt:
         kwargs["prompt"] = prompt
-    with kwargs["file"] as audio_file:
-        kwargs["file"] = audio_file
-        transcription = client.audio.transcriptions.create(**kwargs)
-    return transcription.text if hasattr(transcription, "text") else str(transcription).strip()
+    stream = on_delta is not None and model_name in STREAMING_TRANSCRIBE_MODELS
+
+    if stream:
+        return _collect_transcription_stream(
+            client.audio.transcriptions.create(file=audio_upload, stream=True, **kwargs),
+            on_delta,
+        )
+    transcription = client.audio.transcriptions.create(file=audio_upload, **kwargs)
+    if hasattr(transcription, "text"):
+        return transcription.text
+    return str(transcription).strip()
+
+
+def _collect_transcription_stream(events, on_delta) -> str:
+    parts: list[str] = []
+    for event in events:
+        event_type = getattr(event, "type", "")
+        if event_type == "transcript.text.delta":
+            parts.append(event.delta)
+            on_delta("".join(parts))
+        elif event_type == "transcript.text.done":
+            return event.text.strip()
+    return "".join(parts).strip()
+
+
+def _openai_client_for_job():
+    """Resolve the client on the script thread; workers cannot read st.secrets/session state."""
+    api_key = _get_openai_api_key()
+    return _get_openai_client(api_key) if api_key else None
 
 
 def _get_openai_api_key() -> str | None:
@@ -156,59 +319,33 @@ def _get_openai_api_key() -> str | None:
     )
 
 
+def _default_db_title() -> str:
+    return f"{DEFAULT_ORDER_DB_TITLE} {date.today().strftime('%d.%m.%Y')}"
+
+
 def _normalize_orders_for_json(orders: list[dict]) -> list[dict]:
-    normalized = []
-    for order in orders:
-        entry = dict(order)
-        datum_value = entry.get("Datum")
-        if isinstance(datum_value, datetime):
-            entry["Datum"] = datum_value.replace(microsecond=0).isoformat()
-        elif isinstance(datum_value, date):
-            entry["Datum"] = datetime.combine(datum_value, datetime.min.time()).isoformat()
-        normalized.append(entry)
-    return normalized
+    datum = order_datum_column(orders)
+    iso_values = datum.dt.strftime("%Y-%m-%dT%H:%M:%S").where(datum.notna(), None).tolist()
+    return [{**order, "Datum": value} for order, value in zip(orders, iso_values)]
 
 
 def _orders_for_editor(orders: list[dict]) -> list[dict]:
-    prepared = []
-    for order in orders:
-        entry = dict(order)
-        datum_value = entry.get("Datum")
-        if isinstance(datum_value, str) and datum_value:
-            try:
-                entry["Datum"] = datetime.fromisoformat(datum_value.replace("Z", "+00:00"))
-            except ValueError:
-                entry["Datum"] = None
-        prepared.append(entry)
-    return prepared
-
-
-def _orders_to_editor_df(orders: list[dict]) -> pd.DataFrame:
-    df = pd.DataFrame(orders)
-    if "Datum" not in df.columns:
-        df["Datum"] = pd.NaT
-    df["Datum"] = df["Datum"].replace("", pd.NA)
-    df["Datum"] = pd.to_datetime(df["Datum"], errors="coerce")
-    return df
+    datum = order_datum_column(orders)
+    values = datum.astype(object).where(datum.notna(), None).tolist()
+    return [{**order, "Datum": value} for order, value in zip(orders, values)]
 
 
 def _extract_orders_api(
+    client,
     transcript_text: str,
     model_name: str,
     output_template: dict,
     system_prompt_base: str,
     default_eintragender: str = "",
+    on_order=None,
 ) -> tuple[dict, dict | None]:
-    from openai import OpenAI
     debug = True
 
-    api_key = _get_openai_api_key()
-    if not api_key:
-        raise RuntimeError(
-            "OPENAI_API_KEY nicht gefunden. Bitte in .env oder st.secrets setzen."
-        )
-
-    client = OpenAI(api_key=api_key)
     output_structure = output_template or default_output_schema()
     system_prompt = build_system_prompt_with_descriptions(
         system_prompt_base,
@@ -218,55 +355,141 @@ def _extract_orders_api(
     logger.info("OpenAI extraction request model=%s", model_name)
     logger.info("OpenAI extraction system prompt:\n%s", system_prompt)
     logger.info("OpenAI extraction user prompt:\n%s", user_prompt)
-    tool_schema = get_tools_for_target("orders_v1")
+    response_format = get_response_format_for_target("orders_v1")
     logger.info(
-        "OpenAI extraction tool schema:\n%s",
-        json.dumps(tool_schema, ensure_ascii=True, indent=2),
+        "OpenAI extraction response format:\n%s",
+        json.dumps(response_format, ensure_ascii=True, indent=2),
     )
-    parsed, trace = extract_with_repair(
-        client=client,
-        model_name=model_name,
-        system_prompt=system_prompt,
-        user_content=user_prompt,
-        target_key="orders_v1",
-        context={"default_eintragender": default_eintragender},
-        max_retries=2,
-        temperature=0,
+    cache_key = _extraction_cache_key(
+        model_name, system_prompt, user_prompt, response_format, default_eintragender
     )
+    parsed = _read_cached_extraction(cache_key)
+    if parsed is not None:
+        logger.info("OpenAI extraction cache hit key=%s", cache_key)
+        trace = {"cache_key": cache_key, "cache_hit": True}
+    else:
+        if client is None:
+            raise RuntimeError(
+                "OPENAI_API_KEY nicht gefunden. Bitte in .env oder st.secrets setzen."
+            )
+        parsed, trace = extract_with_repair(
+            client=client,
+            model_name=model_name,
+            system_prompt=system_prompt,
+            user_content=user_prompt,
+            target_key="orders_v1",
+            context={"default_eintragender": default_eintragender},
+            max_retries=2,
+            temperature=0,
+            on_item=on_order,
+        )
+        _write_cached_extraction(cache_key, parsed)
 
     if debug:
         return parsed, {
             "system": system_prompt,
             "user": user_prompt,
-            "tools": tool_schema,
+            "response_format": response_format,
             "trace": trace,
         }
     return parsed, None
 
 
+def _extraction_cache_key(
+    model_name: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_format: dict,
+    default_eintragender: str,
+) -> str:
+    payload = json.dumps(
+        [model_name, system_prompt, user_prompt, response_format, default_eintragender],
+        ensure_ascii=True,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_cached_extraction(cache_key: str) -> dict | None:
+    path = EXTRACTION_CACHE_DIR / f"{cache_key}.json"
+    try:
+        if not path.exists():
+            return None
+        if time.time() - path.stat().st_mtime > EXTRACTION_CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Extraktions-Cache nicht lesbar (%s): %s", path, exc)
+        return None
+
+
+def _write_cached_extraction(cache_key: str, parsed: dict) -> None:
+    path = EXTRACTION_CACHE_DIR / f"{cache_key}.json"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(parsed, ensure_ascii=True), encoding="utf-8")
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Extraktions-Cache nicht schreibbar (%s): %s", path, exc)
+    _prune_extraction_cache()
+
+
+def _prune_extraction_cache() -> None:
+    try:
+        with os.scandir(EXTRACTION_CACHE_DIR) as entries:
+            cached = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            ]
+    except OSError as exc:
+        logger.warning("Extraktions-Cache nicht lesbar (%s): %s", EXTRACTION_CACHE_DIR, exc)
+        return
+    cached.sort(reverse=True)
+    cutoff = time.time() - EXTRACTION_CACHE_TTL_SECONDS
+    for index, (mtime, path) in enumerate(cached):
+        if index < EXTRACTION_CACHE_MAX_ENTRIES and mtime >= cutoff:
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass  # another job pruned it first
+        except OSError as exc:
+            logger.warning("Extraktions-Cache nicht löschbar (%s): %s", path, exc)
+
+
 def _run_transcription(
-    audio_payload,
+    client,
+    audio_bytes: bytes,
     transcribe_mode: str,
     local_model: str,
     api_model: str,
     api_prompt_text: str,
+    on_delta=None,
 ) -> str:
+    if transcribe_mode != "Lokal (Whisper)":
+        product_values = allowed_product_values()
+        if product_values:
+            product_hint = "Produktliste: " + ", ".join(product_values)
+            if api_prompt_text:
+                api_prompt_text = f"{api_prompt_text}\n{product_hint}"
+            else:
+                api_prompt_text = product_hint
+        logger.info("OpenAI transcription prompt:\n%s", api_prompt_text or "")
+        return _transcribe_audio_api(
+            client,
+            _encode_audio_for_upload(audio_bytes),
+            api_model,
+            api_prompt_text or None,
+            on_delta=on_delta,
+        )
+
+    # Local Whisper reads from a path, so only this mode needs a temp file.
     with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-        tmp_file.write(audio_payload.getvalue())
+        tmp_file.write(audio_bytes)
         tmp_path = Path(tmp_file.name)
     try:
-        if transcribe_mode == "Lokal (Whisper)":
-            transcript_text = _transcribe_audio(tmp_path, local_model)
-        else:
-            product_values = allowed_product_values()
-            if product_values:
-                product_hint = "Produktliste: " + ", ".join(product_values)
-                if api_prompt_text:
-                    api_prompt_text = f"{api_prompt_text}\n{product_hint}"
-                else:
-                    api_prompt_text = product_hint
-            logger.info("OpenAI transcription prompt:\n%s", api_prompt_text or "")
-            transcript_text = _transcribe_audio_api(tmp_path, api_model, api_prompt_text or None)
+        transcript_text = _transcribe_audio(tmp_path, local_model)
     finally:
         try:
             tmp_path.unlink(missing_ok=True)
@@ -275,21 +498,60 @@ def _run_transcription(
     return transcript_text
 
 
-def _run_extraction(
+def _order_job(
+    progress: dict,
+    *,
+    client,
     transcript_text: str,
-    model_name: str,
-    output_template: dict,
-    system_prompt_base: str,
-    default_eintragender_value: str,
-) -> tuple[dict, dict | None]:
+    transcription: dict,
+    extraction: dict | None,
+) -> dict:
+    """Transcribe (unless a transcript exists) and optionally extract, on a worker thread."""
+
+    def _on_delta(text: str) -> None:
+        progress["transcript"] = text
+
+    if not transcript_text:
+        transcript_text = _run_transcription(client, on_delta=_on_delta, **transcription)
+    result = {"transcript_text": transcript_text, "extract": extraction is not None}
+    if extraction is None or not transcript_text:
+        return result
+
     orders_json, prompt_payload = _extract_orders_api(
+        client,
         transcript_text,
-        model_name,
-        output_template,
-        system_prompt_base,
-        default_eintragender=default_eintragender_value,
+        on_order=progress["orders"].append,
+        **extraction,
     )
-    return orders_json, prompt_payload
+    result["orders_json"] = orders_json
+    result["prompt_payload"] = prompt_payload
+    return result
+
+
+def _submit_order_job(label: str, extraction: dict | None) -> None:
+    try:
+        client = _openai_client_for_job()
+    except ModuleNotFoundError as exc:
+        _show_job_error(exc, mode)
+        return
+    _start_order_job(
+        label,
+        mode,
+        functools.partial(
+            _order_job,
+            client=client,
+            transcript_text=st.session_state.get("transcript_text", ""),
+            transcription={
+                "audio_bytes": audio_data.getvalue(),
+                "transcribe_mode": mode,
+                "local_model": model_choice,
+                "api_model": api_model_choice,
+                "api_prompt_text": api_prompt,
+            },
+            extraction=extraction,
+        ),
+    )
+
 
 if debugging_mode:
     with st.expander("🔍 Debug: .env / Env-Status", expanded=False):
@@ -306,45 +568,13 @@ if debugging_mode:
         st.write(f"OPENAI_API_KEY in st.secrets: {secrets_present}")
 
 
+job_running = ORDER_JOB_KEY in st.session_state
+
 if audio_data is not None:
     st.audio(audio_data)
 
-    if st.button("Transkribieren"):
-        with st.spinner("Transkribiere Audio…"):
-            try:
-                transcript_text = st.session_state.get("transcript_text", "")
-                if not transcript_text:
-                    transcript_text = _run_transcription(
-                        audio_data,
-                        mode,
-                        model_choice,
-                        api_model_choice,
-                        api_prompt,
-                    )
-                if transcript_text:
-                    st.session_state["transcript_text"] = transcript_text
-                    st.text_area(
-                        "Transkript",
-                        transcript_text,
-                        height=180,
-                        key="transcript_preview",
-                    )
-            except ModuleNotFoundError:
-                if mode == "Lokal (Whisper)":
-                    logger.error("Whisper module missing for local transcription.")
-                    st.error(
-                        "Whisper ist nicht installiert. Bitte `openai-whisper` installieren, "
-                        "z.B. `uv pip install openai-whisper`."
-                    )
-                else:
-                    logger.error("OpenAI SDK missing for API transcription.")
-                    st.error(
-                        "OpenAI SDK ist nicht installiert. Bitte `openai` installieren, "
-                        "z.B. `uv pip install openai`."
-                    )
-            except Exception as exc:
-                logger.exception("Transkription fehlgeschlagen.")
-                st.error(f"Transkription fehlgeschlagen: {exc}")
+    if st.button("Transkribieren", disabled=job_running):
+        _submit_order_job("Transkribiere Audio…", extraction=None)
 
 if st.session_state.get("transcript_text"):
     st.text_area(
@@ -404,61 +634,38 @@ with st.expander("🧠 Prompt-Konfiguration (Helper)", expanded=False):
     st.json(output_schema_json_schema())
     st.json(field_descriptions_from_model())
 
-if audio_data is not None and st.button("Transkribieren + extrahieren"):
-    with st.spinner("Transkribiere und extrahiere…"):
-        try:
-            transcript_text = st.session_state.get("transcript_text", "")
-            if not transcript_text:
-                transcript_text = _run_transcription(
-                    audio_data,
-                    mode,
-                    model_choice,
-                    api_model_choice,
-                    api_prompt,
-                )
-            if transcript_text:
-                st.session_state["transcript_text"] = transcript_text
-                orders_json, prompt_payload = _run_extraction(
-                    transcript_text,
-                    extract_model,
-                    st.session_state.get("orders_output_template"),
-                    base_system_prompt,
-                    default_eintragender,
-                )
-                st.session_state["orders_json"] = orders_json
-                st.session_state["orders_prompt_payload"] = prompt_payload
-            else:
-                st.warning("Kein Text erkannt. Bitte mit klarer Sprache erneut versuchen.")
-        except ModuleNotFoundError:
-            if mode == "Lokal (Whisper)":
-                logger.error("Whisper module missing for local transcription.")
-                st.error(
-                    "Whisper ist nicht installiert. Bitte `openai-whisper` installieren, "
-                    "z.B. `uv pip install openai-whisper`."
-                )
-            else:
-                logger.error("OpenAI SDK missing for API transcription.")
-                st.error(
-                    "OpenAI SDK ist nicht installiert. Bitte `openai` installieren, "
-                    "z.B. `uv pip install openai`."
-                )
-        except Exception as exc:
-            logger.exception("Transkription/Extraktion fehlgeschlagen.")
-            st.error(f"Transkription/Extraktion fehlgeschlagen: {exc}")
-
+if audio_data is not None and st.button("Transkribieren + extrahieren", disabled=job_running):
+    _submit_order_job(
+        "Transkribiere und extrahiere…",
+        extraction={
+            "model_name": extract_model,
+            "output_template": st.session_state.get("orders_output_template"),
+            "system_prompt_base": base_system_prompt,
+            "default_eintragender": default_eintragender,
+        },
+    )
 
+# The job runs on the worker pool; only this fragment reruns while it is in flight,
+# so the rest of the page (and other sessions) stay responsive.
+st.fragment(
+    _order_job_status,
+    run_every=ORDER_JOB_POLL_SECONDS if ORDER_JOB_KEY in st.session_state else None,
+)()
+if "order_job_error" in st.session_state:
+    _show_job_error(*st.session_state.pop("order_job_error"))
+if "order_job_warning" in st.session_state:
+    st.warning(st.session_state.pop("order_job_warning"))
 
 
 current_orders = None
 if st.session_state.get("orders_json", {}).get("orders"):
     st.subheader("✏️ Bestellungen bearbeiten")
-    edited_orders = st.data_editor(
-        _orders_to_editor_df(st.session_state["orders_json"]["orders"]),
+    current_orders = st.data_editor(
+        _orders_for_editor(st.session_state["orders_json"]["orders"]),
         num_rows="dynamic",
         width="stretch",
         key="orders_editor",
     )
-    current_orders = edited_orders.to_dict(orient="records")
     if st.button("Änderungen übernehmen"):
         st.session_state["orders_json"]["orders"] = _normalize_orders_for_json(current_orders)
         st.success("Änderungen gespeichert.")
@@ -466,8 +673,6 @@ if st.session_state.get("orders_json", {}).get("orders"):
 if st.session_state.get("orders_json"):
     if current_orders is None:
         current_orders = st.session_state["orders_json"].get("orders", [])
-    current_json = dict(st.session_state["orders_json"])
-    current_json["orders"] = _normalize_orders_for_json(current_orders)
 
     st.caption("Erstellt eine neue Notion-Datenbank auf einer Seite und speichert alle Bestellungen.")
     notion_page_id = st.text_input(
@@ -494,10 +699,11 @@ if st.session_state.get("orders_json"):
     )
     st.session_state["notion_db_id"] = notion_db_id
 
-    default_title = f"{DEFAULT_ORDER_DB_TITLE} {date.today().strftime('%d.%m.%Y')}"
+    if "notion_db_title" not in st.session_state:
+        st.session_state["notion_db_title"] = _default_db_title()
     db_title = st.text_input(
         "Neuer Datenbank-Titel",
-        value=st.session_state.get("notion_db_title", default_title),
+        value=st.session_state["notion_db_title"],
     )
     st.session_state["notion_db_title"] = db_title
 
@@ -520,7 +726,7 @@ if st.session_state.get("orders_json"):
                     st.error(f"Datenbank-Erstellung fehlgeschlagen: {exc}")
 
     if st.button("Bestellungen in Notion speichern"):
-        orders = current_json.get("orders", [])
+        orders = _normalize_orders_for_json(current_orders)
         if not orders:
             st.warning("Keine Bestellungen gefunden.")
         elif not st.session_state.get("notion_db_id"):
@@ -528,8 +734,12 @@ if st.session_state.get("orders_json"):
         else:
             with st.spinner("Schreibe Bestellungen nach Notion…"):
                 try:
-                    count = insert_orders(st.session_state["notion_db_id"], orders)
-                    st.success(f"{count} Bestellungen gespeichert.")
+                    result = insert_orders(st.session_state["notion_db_id"], orders)
+                    if result.created:
+                        st.success(f"{result.created} Bestellungen gespeichert.")
+                    if result.failed:
+                        logger.error("Notion-Export unvollständig: %s", result.failed)
+                        st.error(describe_failed_orders(orders, result.failed))
                 except Exception as exc:
                     logger.exception("Notion-Export fehlgeschlagen.")
                     st.error(f"Notion-Export fehlgeschlagen: {exc}")
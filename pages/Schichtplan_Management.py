@@ -13,7 +13,12 @@ import streamlit as st
 from src.app_paths import SCHICHTPLAN_DATA_DIR
 from src.logging_config import logger as app_logger
 from src.notion_access import NotionRequestError, flatten_properties, notion_request
-from src.schichtplan_utils import AVAILABILITY_COLUMNS, generate_schichtplan, normalize_fixed_schedule_records
+from src.schichtplan_utils import (
+    AVAILABILITY_COLUMNS,
+    dedupe_person_info,
+    generate_schichtplan,
+    normalize_fixed_schedule_records,
+)
 
 # Page title
 st.title("👥 Schichtplan Management")
@@ -554,10 +559,15 @@ def save_uploaded_file(uploaded_file):
     logger.info("Saved availability upload successfully: %s", file_path)
     return file_path
 
+def read_availability_csv(source) -> pd.DataFrame:
+    """Read an availability export with pyarrow's multithreaded CSV reader."""
+    return pd.read_csv(source, engine="pyarrow")
+
+
 def quick_format_validation(csv_file_path):
     """Quick validation of timespan format compatibility."""
     try:
-        df = pd.read_csv(csv_file_path)
+        df = read_availability_csv(csv_file_path)
         return quick_format_validation_from_dataframe(df)
     except Exception as e:
         logger.exception("Schichtplan format validation failed while reading file=%s", csv_file_path)
@@ -685,7 +695,7 @@ def perform_availability_evaluation_from_dataframe(df, person_info, source_label
         person_info_names = set(name_list)
 
         # Import the matching function from schichtplan_utils
-        from src.schichtplan_utils import match_name
+        from src.schichtplan_utils import match_names
 
         # Perform name matching analysis similar to generate_schichtplan
         unique_names_set = set(original_unique_names)
@@ -700,8 +710,9 @@ def perform_availability_evaluation_from_dataframe(df, person_info, source_label
         matched_names = set()
         unmatched_names = set()
 
+        name_matches = match_names(original_unique_names, name_list)
         for name in original_unique_names:
-            matched = match_name(name, name_list)
+            matched = name_matches.get(name)
             if matched:
                 matched_names.add(matched)
             else:
@@ -738,7 +749,7 @@ def perform_upload_evaluation(csv_file_path, person_info):
     """Perform name evaluation analysis on uploaded file."""
     try:
         # Read the uploaded CSV
-        df = pd.read_csv(csv_file_path)
+        df = read_availability_csv(csv_file_path)
         evaluation = perform_availability_evaluation_from_dataframe(
             df,
             person_info,
@@ -769,7 +780,7 @@ def to_person_info_tuples(person_rows, require_full: bool = True):
         else:
             if name:
                 rows.append((name, location, task))
-    return rows
+    return dedupe_person_info(rows)
 
 
 # Get next month dates
@@ -860,7 +871,7 @@ if selected_source == "Notion":
 else:
     if uploaded_file is not None:
         try:
-            availability_data = pd.read_csv(io.BytesIO(uploaded_file.getvalue()))
+            availability_data = read_availability_csv(io.BytesIO(uploaded_file.getvalue()))
             availability_data_source = f"Lokal/Upload: {uploaded_file.name}"
         except Exception:
             logger.exception("Failed reading uploaded availability file: %s", uploaded_file.name)
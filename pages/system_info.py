@@ -1,3 +1,4 @@
+import logging
 import os
 from datetime import datetime
 from pathlib import Path
@@ -26,12 +27,27 @@ required_dirs = [
     str(pages_dir),
 ]
 
+
+def _existing_entries(parent: str) -> set[str]:
+    try:
+        with os.scandir(parent or ".") as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+# One directory listing per parent instead of one stat call per required directory.
+entries_by_parent: dict[str, set[str]] = {}
 st.write("**Required Directories:**")
 for dir_name in required_dirs:
-    if os.path.exists(dir_name):
+    parent, name = os.path.split(os.path.normpath(dir_name))
+    if parent not in entries_by_parent:
+        entries_by_parent[parent] = _existing_entries(parent)
+    if name in entries_by_parent[parent]:
         st.write(f"✅ {dir_name}")
     else:
         st.write(f"❌ {dir_name}")
 
-logger.debug("Session state: %s", dict(st.session_state))
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug("Session state: %s", dict(st.session_state))
 st.caption("Session state logged to terminal.")
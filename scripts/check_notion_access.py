@@ -1,14 +1,142 @@
 #!/usr/bin/env python3
 import argparse
+import contextlib
+import csv
+import hashlib
+import json
 import os
+import pickle
 import sys
-from typing import Any, Dict, Iterable, List
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 try:
-    import pandas as pd  # type: ignore
+    import xlsxwriter  # type: ignore
 except Exception:  # pragma: no cover - optional dependency for output
-    pd = None
+    xlsxwriter = None
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional faster JSON codec
+    orjson = None
+
+NOTION_API_BASE = "https://api.notion.com/v1"
+NOTION_MAX_CONCURRENT_REQUESTS = 3
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_RATE_LIMIT_RETRIES = 5
+QUERY_PAGE_SIZE = 100
+DEFAULT_ROWS_CACHE_DIR = Path.home() / ".cache" / "notion_rows"
+_WRITABLE_TYPES = frozenset(
+    {
+        "title",
+        "rich_text",
+        "number",
+        "select",
+        "multi_select",
+        "date",
+        "people",
+        "files",
+        "checkbox",
+        "url",
+        "email",
+        "phone_number",
+        "relation",
+        "status",
+    }
+)
+_HEAVY_TYPES = frozenset({"people", "files", "relation"})
+
+
+def _build_session(retry: Retry) -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry))
+    return session
+
+
+# Reads (GET plus the query/search POSTs) may be resent after a timeout or 5xx. 429s are
+# left to AdaptiveLimiter in notion_request so they can also shrink the concurrency.
+_READ_SESSION = _build_session(
+    Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+)
+# Creates (POST /pages, /databases) only retry failed connects: after a read timeout or
+# 5xx the page may already exist, and a resend would duplicate it.
+_WRITE_SESSION = _build_session(
+    Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.5, raise_on_status=False)
+)
+
+
+def _is_read_request(method: str, path: str) -> bool:
+    if method == "GET":
+        return True
+    return method == "POST" and (path == "/search" or path.endswith("/query"))
+
+
+class AdaptiveLimiter:
+    """Pace requests to a steady rate and adapt the in-flight cap to 429 feedback (AIMD).
+
+    A 429 halves the concurrency cap; each run of successes as long as the cap grows it by
+    one again, up to max_concurrency.
+    """
+
+    def __init__(self, rps: float, max_concurrency: int) -> None:
+        self._cond = threading.Condition()
+        self.configure(rps, max_concurrency)
+
+    def configure(self, rps: float, max_concurrency: int) -> None:
+        with self._cond:
+            self._interval = 1.0 / rps if rps > 0 else 0.0
+            self._max_limit = max(1, max_concurrency)
+            self._limit = self._max_limit
+            self._active = 0
+            self._successes = 0
+            self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._active >= self._limit:
+                self._cond.wait()
+            self._active += 1
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def release(self, throttled: bool) -> None:
+        with self._cond:
+            self._active -= 1
+            if throttled:
+                self._limit = max(1, self._limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self._limit and self._limit < self._max_limit:
+                    self._limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+_RATE_LIMITER = AdaptiveLimiter(NOTION_REQUESTS_PER_SECOND, NOTION_MAX_CONCURRENT_REQUESTS)
+
+
+def _retry_after_seconds(resp: requests.Response) -> float:
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", 1)))
+    except ValueError:
+        return 1.0
 
 
 class NotionRequestError(RuntimeError):
@@ -28,58 +156,134 @@ def load_env_fallback() -> None:
         pass
 
 
-def notion_request(method: str, path: str, token: str, payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    base_url = "https://api.notion.com/v1"
-    headers = {
+@lru_cache(maxsize=None)
+def _notion_headers(token: str) -> Dict[str, str]:
+    return {
         "Authorization": f"Bearer {token}",
         "Notion-Version": "2022-06-28",
         "Content-Type": "application/json",
     }
-    url = f"{base_url}{path}"
-    resp = requests.request(method, url, headers=headers, json=payload, timeout=30)
+
+
+def notion_request(method: str, path: str, token: str, payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    url = f"{NOTION_API_BASE}{path}"
+    headers = _notion_headers(token)
+    if orjson is None:
+        send = {"json": payload}
+    else:
+        send = {"data": None if payload is None else orjson.dumps(payload)}
+    session = _READ_SESSION if _is_read_request(method, path) else _WRITE_SESSION
+    # A 429 means Notion did not process the request, so it is resent for creates as well.
+    for attempt in range(NOTION_RATE_LIMIT_RETRIES + 1):
+        _RATE_LIMITER.acquire()
+        throttled = False
+        try:
+            resp = session.request(method, url, headers=headers, timeout=30, **send)
+            throttled = resp.status_code == 429
+        finally:
+            _RATE_LIMITER.release(throttled)
+        if not throttled or attempt == NOTION_RATE_LIMIT_RETRIES:
+            break
+        time.sleep(_retry_after_seconds(resp))
     if not resp.ok:
         raise NotionRequestError(
             f"{method} {path} failed: {resp.status_code} {resp.text}",
             resp.status_code,
             resp.text,
         )
-    return resp.json()
+    return resp.json() if orjson is None else orjson.loads(resp.content)
+
+
+@lru_cache(maxsize=256)
+def notion_get_cached(path: str, token: str) -> Dict[str, Any]:
+    """GET path once per process; callers must treat the shared result as read-only."""
+    return notion_request("GET", path, token)
 
 
-def summarize_objects(items: List[Dict[str, Any]], label_key: str) -> List[str]:
-    summaries: List[str] = []
+def _iter_user_names(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
     for item in items:
-        name = None
-        if label_key == "user":
-            name = item.get("name") or item.get("id")
-        else:
-            title = item.get("title") or []
-            if isinstance(title, list) and title:
-                name = title[0].get("plain_text")
-            name = name or item.get("id")
-        summaries.append(name)
-    return summaries
-
-
-def iter_database_rows(token: str, database_id: str) -> Iterable[Dict[str, Any]]:
-    payload: Dict[str, Any] = {"page_size": 100}
-    while True:
-        data = notion_request("POST", f"/databases/{database_id}/query", token, payload)
-        for row in data.get("results", []):
-            yield row
-        if not data.get("has_more"):
-            break
-        payload["start_cursor"] = data.get("next_cursor")
+        yield item.get("name") or item.get("id")
+
+
+def _iter_title_names(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for item in items:
+        title = item.get("title") or []
+        name = title[0].get("plain_text") if isinstance(title, list) and title else None
+        yield name or item.get("id")
+
+
+def summarize_objects(items: Iterable[Dict[str, Any]], label_key: str) -> Iterator[str]:
+    if label_key == "user":
+        return _iter_user_names(items)
+    return _iter_title_names(items)
+
+
+def iter_database_rows(
+    token: str,
+    database_id: str,
+    first_page: Dict[str, Any] | None = None,
+) -> Iterable[Dict[str, Any]]:
+    """Yield query rows; first_page lets a caller seed a page it already fetched."""
+    path = f"/databases/{database_id}/query"
+    payload: Dict[str, Any] = {"page_size": QUERY_PAGE_SIZE}
+    # Request page N+1 in the background while the caller works through page N.
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        data = first_page if first_page is not None else notion_request("POST", path, token, payload)
+        while True:
+            next_page = None
+            if data.get("has_more"):
+                payload = {**payload, "start_cursor": data.get("next_cursor")}
+                next_page = prefetcher.submit(notion_request, "POST", path, token, payload)
+            yield from data.get("results", [])
+            if next_page is None:
+                break
+            data = next_page.result()
+
+
+def _newest_row_edit(token: str, database_id: str) -> str | None:
+    page = notion_request(
+        "POST",
+        f"/databases/{database_id}/query",
+        token,
+        {"page_size": 1, "sorts": [{"timestamp": "last_edited_time", "direction": "descending"}]},
+    )
+    results = page.get("results") or []
+    return results[0].get("last_edited_time") if results else None
+
+
+def cached_database_rows(
+    token: str,
+    database_id: str,
+    source: Dict[str, Any],
+    cache_dir: Path,
+) -> List[Dict[str, Any]]:
+    """Return all query rows, reusing a pickle from cache_dir while the database is unchanged.
+
+    The cache key covers the schema's and the newest row's last_edited_time, so any edit
+    invalidates it; removing an older row does not, which is acceptable for dev reruns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (database_id, source.get("last_edited_time"), _newest_row_edit(token, database_id)):
+        digest.update(str(part or "").encode())
+        digest.update(b"\0")
+    cache_path = cache_dir / f"{digest.hexdigest()}.pkl"
+    if cache_path.exists():
+        with cache_path.open("rb") as fh:
+            return pickle.load(fh)
+
+    rows = list(iter_database_rows(token, database_id))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    with tmp_path.open("wb") as fh:
+        pickle.dump(rows, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(cache_path)
+    return rows
 
 
 def extract_plain_text(value: Any) -> str:
     if isinstance(value, list):
-        parts = []
-        for item in value:
-            text = item.get("plain_text")
-            if text:
-                parts.append(text)
-        return "".join(parts)
+        # Missing or empty plain_text contributes "", so no per-item filter branch is needed.
+        return "".join([item.get("plain_text") or "" for item in value])
     if isinstance(value, dict):
         return value.get("plain_text") or value.get("name") or ""
     if value is None:
@@ -87,42 +291,119 @@ def extract_plain_text(value: Any) -> str:
     return str(value)
 
 
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _option_name(value: Any) -> Any:
+    return value.get("name") if isinstance(value, dict) else None
+
+
+def _item_names(value: Any) -> List[Any]:
+    return [v.get("name") for v in value or []]
+
+
+def _person_labels(value: Any) -> List[Any]:
+    return [v.get("name") or v.get("id") for v in value or []]
+
+
+def _item_ids(value: Any) -> List[Any]:
+    return [v.get("id") for v in value or []]
+
+
+# Property types not listed here (number, checkbox, date, url, formula, ...) pass through.
+_PROP_HANDLERS: Dict[str, Callable[[Any], Any]] = {
+    "title": extract_plain_text,
+    "rich_text": extract_plain_text,
+    "select": _option_name,
+    "status": _option_name,
+    "multi_select": _item_names,
+    "files": _item_names,
+    "people": _person_labels,
+    "relation": _item_ids,
+}
+
+
 def flatten_properties(props: Dict[str, Any]) -> Dict[str, Any]:
+    handler_for = _PROP_HANDLERS.get
     flat: Dict[str, Any] = {}
     for key, prop in props.items():
         ptype = prop.get("type")
-        value = prop.get(ptype)
-        if ptype in {"title", "rich_text"}:
-            flat[key] = extract_plain_text(value)
-        elif ptype == "select":
-            flat[key] = value.get("name") if isinstance(value, dict) else None
-        elif ptype == "multi_select":
-            flat[key] = [v.get("name") for v in value or []]
-        elif ptype == "people":
-            flat[key] = [v.get("name") or v.get("id") for v in value or []]
-        elif ptype in {"email", "phone_number", "url"}:
-            flat[key] = value
-        elif ptype == "number":
-            flat[key] = value
-        elif ptype == "checkbox":
-            flat[key] = value
-        elif ptype == "date":
-            flat[key] = value
-        elif ptype == "status":
-            flat[key] = value.get("name") if isinstance(value, dict) else None
-        elif ptype == "relation":
-            flat[key] = [v.get("id") for v in value or []]
-        elif ptype == "files":
-            flat[key] = [v.get("name") for v in value or []]
-        elif ptype == "formula":
-            flat[key] = value
-        elif ptype == "rollup":
-            flat[key] = value
-        else:
-            flat[key] = value
+        flat[key] = handler_for(ptype, _identity)(prop.get(ptype))
     return flat
 
 
+def collect_flat_columns(
+    rows: Iterable[Dict[str, Any]],
+    schema_props: Dict[str, Any],
+) -> Dict[str, List[Any]]:
+    """Flatten rows straight into one list per schema column, with handlers resolved once.
+
+    Rows are flattened as they arrive, so the nested property JSON of a page can be
+    released instead of being buffered for the whole database.
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in schema_props}
+    specs = [
+        (name, prop.get("type"), _PROP_HANDLERS.get(prop.get("type"), _identity), columns[name].append)
+        for name, prop in schema_props.items()
+    ]
+    for row in rows:
+        props = row.get("properties") or {}
+        for name, ptype, handler, append in specs:
+            prop = props.get(name)
+            append(None if prop is None else handler(prop.get(ptype)))
+    return columns
+
+
+def _xlsx_cell(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return str(value)
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def write_xlsx(df: Any, path: str) -> None:
+    """Write df row by row in xlsxwriter's constant_memory mode, flushing each row to disk."""
+    if xlsxwriter is None:
+        df.to_excel(path, index=False)
+        return
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet("Sheet1")
+        worksheet.write_row(0, 0, [str(column) for column in df.columns], workbook.add_format({"bold": True}))
+        # astype(object) hands back plain Python scalars, so numpy bools stay booleans.
+        for row_index, values in enumerate(df.astype(object).itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_index, 0, [_xlsx_cell(value) for value in values])
+    finally:
+        workbook.close()
+
+
+def _jsonl_line(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False).encode() + b"\n"
+
+
+def write_jsonl(rows: Iterable[Dict[str, Any]], out: BinaryIO) -> int:
+    """Stream one flattened JSON object per row; nothing is buffered beyond the current page."""
+    count = 0
+    for row in rows:
+        out.write(_jsonl_line(flatten_properties(row.get("properties") or {})))
+        count += 1
+    return count
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], schema_props: Dict[str, Any], out: Any) -> int:
+    writer = csv.DictWriter(out, fieldnames=list(schema_props), extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(flatten_properties(row.get("properties") or {}))
+        count += 1
+    return count
+
+
 def append_title_suffix(title: Any, suffix: str) -> List[Dict[str, Any]]:
     if not isinstance(title, list):
         title = []
@@ -137,6 +418,11 @@ def append_title_suffix(title: Any, suffix: str) -> List[Dict[str, Any]]:
     return new_title
 
 
+@lru_cache(maxsize=1024)
+def _get_block(block_id: str, token: str) -> Dict[str, Any]:
+    return notion_request("GET", f"/blocks/{block_id}", token)
+
+
 def resolve_parent_for_database(token: str, parent: Dict[str, Any]) -> Dict[str, Any]:
     parent_type = parent.get("type")
     if parent_type in {"page_id", "workspace"}:
@@ -144,7 +430,7 @@ def resolve_parent_for_database(token: str, parent: Dict[str, Any]) -> Dict[str,
     if parent_type == "block_id":
         block_id = parent.get("block_id")
         while block_id:
-            block = notion_request("GET", f"/blocks/{block_id}", token)
+            block = _get_block(block_id, token)
             block_parent = block.get("parent") or {}
             block_parent_type = block_parent.get("type")
             if block_parent_type in {"page_id", "workspace"}:
@@ -156,8 +442,13 @@ def resolve_parent_for_database(token: str, parent: Dict[str, Any]) -> Dict[str,
     raise ValueError(f"Unsupported parent type for copy: {parent_type}")
 
 
-def copy_database(token: str, database_id: str, suffix: str = " (Copy)") -> Dict[str, Any]:
-    source = notion_request("GET", f"/databases/{database_id}", token)
+def copy_database(
+    token: str,
+    database_id: str,
+    suffix: str = " (Copy)",
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """Create a schema-only copy; returns (created database, fetched source database)."""
+    source = notion_get_cached(f"/databases/{database_id}", token)
     parent = resolve_parent_for_database(token, source.get("parent") or {})
     payload: Dict[str, Any] = {
         "parent": parent,
@@ -172,33 +463,16 @@ def copy_database(token: str, database_id: str, suffix: str = " (Copy)") -> Dict
         payload["cover"] = source["cover"]
     if source.get("is_inline") is not None:
         payload["is_inline"] = source["is_inline"]
-    return notion_request("POST", "/databases", token, payload)
+    return notion_request("POST", "/databases", token, payload), source
 
 
-def build_create_properties(props: Dict[str, Any], skip_props: Iterable[str]) -> Dict[str, Any]:
-    writable_types = {
-        "title",
-        "rich_text",
-        "number",
-        "select",
-        "multi_select",
-        "date",
-        "people",
-        "files",
-        "checkbox",
-        "url",
-        "email",
-        "phone_number",
-        "relation",
-        "status",
-    }
-    skip = {name.strip() for name in skip_props if name.strip()}
+def build_create_properties(props: Dict[str, Any], skip: frozenset[str]) -> Dict[str, Any]:
     create_props: Dict[str, Any] = {}
     for name, prop in props.items():
         if name in skip:
             continue
         ptype = prop.get("type")
-        if ptype not in writable_types:
+        if ptype not in _WRITABLE_TYPES:
             continue
         value = prop.get(ptype)
         if ptype == "people":
@@ -214,29 +488,65 @@ def build_create_properties(props: Dict[str, Any], skip_props: Iterable[str]) ->
 
 
 def heavy_property_names(props: Dict[str, Any]) -> List[str]:
-    heavy_types = {"people", "files", "relation"}
     names: List[str] = []
     for name, prop in props.items():
-        if prop.get("type") in heavy_types:
+        if prop.get("type") in _HEAVY_TYPES:
             names.append(name)
     return names
 
 
+class RowCopyError(RuntimeError):
+    def __init__(self, copied: int, failures: List[tuple[str, Exception]]) -> None:
+        first_id, first_exc = failures[0]
+        super().__init__(
+            f"{len(failures)} rows failed to copy ({copied} copied); first failure {first_id}: {first_exc}"
+        )
+        self.copied = copied
+        self.failures = failures
+
+
 def copy_database_rows(
     token: str,
     source_database_id: str,
     target_database_id: str,
     skip_props: Iterable[str],
+    max_workers: int = NOTION_MAX_CONCURRENT_REQUESTS,
 ) -> int:
+    skip = frozenset(name.strip() for name in skip_props if name.strip())
+    max_workers = max(1, max_workers)
     count = 0
-    for row in iter_database_rows(token, source_database_id):
-        props = row.get("properties") or {}
-        payload = {
-            "parent": {"database_id": target_database_id},
-            "properties": build_create_properties(props, skip_props),
-        }
-        notion_request("POST", "/pages", token, payload)
-        count += 1
+    failures: List[tuple[str, Exception]] = []
+    pending: Dict[Any, str] = {}
+
+    def drain(return_when: str) -> None:
+        nonlocal count
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            row_id = pending.pop(future)
+            exc = future.exception()
+            if exc is None:
+                count += 1
+            else:
+                failures.append((row_id, exc))
+
+    # Notion has no bulk page-create endpoint, so rows go out one POST each, with a bounded
+    # number in flight while pagination continues (about three requests per second per
+    # integration). A failed row is recorded and the rest of the copy carries on.
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for row in iter_database_rows(token, source_database_id):
+            props = row.get("properties") or {}
+            payload = {
+                "parent": {"database_id": target_database_id},
+                "properties": build_create_properties(props, skip),
+            }
+            future = pool.submit(notion_request, "POST", "/pages", token, payload)
+            pending[future] = row.get("id") or "?"
+            if len(pending) >= 2 * max_workers:
+                drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+    if failures:
+        raise RowCopyError(count, failures)
     return count
 
 
@@ -244,23 +554,78 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Check Notion API access and optionally dump a database.")
     parser.add_argument("database_id", nargs="?", help="Notion database ID to dump")
     parser.add_argument("--no-search", action="store_true", help="Skip /search calls")
-    parser.add_argument("--output", default="notion_db_output.xlsx", help="XLSX output path")
+    parser.add_argument(
+        "--format",
+        choices=("xlsx", "jsonl", "csv", "none"),
+        default="xlsx",
+        help="Dump format; jsonl/csv stream rows without pandas, none only counts rows",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Output path (default: notion_db_output.<format>; '-' writes jsonl/csv to stdout)",
+    )
     parser.add_argument("--copy", action="store_true", help="Create a schema-only copy of the database")
     parser.add_argument("--copy-rows", action="store_true", help="Copy rows into the newly created database")
     parser.add_argument("--skip-props", default="", help="Comma-separated property names to skip when copying rows")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=NOTION_MAX_CONCURRENT_REQUESTS,
+        help="Upper bound for in-flight Notion requests (halved on 429, regrown on success)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=NOTION_REQUESTS_PER_SECOND,
+        help="Steady request rate towards Notion (requests per second, 0 disables pacing)",
+    )
+    parser.add_argument(
+        "--cache-rows",
+        nargs="?",
+        const=str(DEFAULT_ROWS_CACHE_DIR),
+        default=None,
+        metavar="DIR",
+        help=f"Reuse pickled query rows while the database is unchanged (default dir: {DEFAULT_ROWS_CACHE_DIR})",
+    )
+    parser.add_argument("--profile", action="store_true", help="Print cProfile stats of the run to stderr")
     return parser.parse_args()
 
 
 def main() -> int:
+    args = parse_args()
     load_env_fallback()
     token = os.getenv("NOTION_TOKEN")
     if not token:
         print("Missing NOTION_TOKEN in environment or .env", file=sys.stderr)
         return 1
-    args = parse_args()
     database_id = args.database_id or os.getenv("NOTION_DATABASE_ID")
+    _RATE_LIMITER.configure(args.rps, args.max_concurrency)
+
+    data_out = sys.stdout
+    with contextlib.ExitStack() as stack:
+        if args.output == "-":
+            # Keep stdout clean for the streamed rows; progress output goes to stderr.
+            stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        if not args.profile:
+            return run_checks(args, token, database_id, data_out)
+
+        import cProfile
+        import pstats
 
-    print(os.getenv("NOTION_DATABASE_ID"))
+        profiler = cProfile.Profile()
+        exit_code = profiler.runcall(run_checks, args, token, database_id, data_out)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        return exit_code
+
+
+def run_checks(
+    args: argparse.Namespace,
+    token: str,
+    database_id: str | None,
+    data_out: Any = None,
+) -> int:
+    data_out = data_out or sys.stdout
     try:
         try:
             users = notion_request("GET", "/users", token)
@@ -287,17 +652,22 @@ def main() -> int:
 
         copied_database_id = None
         if database_id and args.copy:
-            copied = copy_database(token, database_id)
+            copied, source_db = copy_database(token, database_id)
             copied_database_id = copied.get("id")
             print(f"Copied database to: {copied_database_id}")
             if args.copy_rows and copied_database_id:
-                source_db = notion_request("GET", f"/databases/{database_id}", token)
                 default_skip = heavy_property_names(source_db.get("properties") or {})
                 cli_skip = [p.strip() for p in args.skip_props.split(",")] if args.skip_props else []
                 skip_props = list(dict.fromkeys(default_skip + cli_skip))
                 if skip_props:
                     print(f"Skipping properties while copying rows: {', '.join(skip_props)}")
-                count = copy_database_rows(token, database_id, copied_database_id, skip_props)
+                count = copy_database_rows(
+                    token,
+                    database_id,
+                    copied_database_id,
+                    skip_props,
+                    max_workers=args.max_concurrency,
+                )
                 print(f"Copied {count} rows into: {copied_database_id}")
         elif args.copy_rows:
             print("--copy-rows requires --copy to be set", file=sys.stderr)
@@ -305,19 +675,53 @@ def main() -> int:
 
         if database_id:
             print(f"Database rows for {database_id}:")
-            rows: List[Dict[str, Any]] = []
-            for row in iter_database_rows(token, database_id):
-                props = row.get("properties", {})
-                flat = flatten_properties(props)
-                rows.append(flat)
-            if pd is None:
-                print("Pandas not available; install it to get a DataFrame output.")
-                return 1
-            df = pd.DataFrame(rows)
-            print("\nDataFrame preview:")
-            print(df.to_string(index=False))
-            df.to_excel(args.output, index=False)
-            print(f"Wrote XLSX: {args.output}")
+            if args.cache_rows:
+                source_db = notion_get_cached(f"/databases/{database_id}", token)
+                schema_props = source_db.get("properties") or {}
+                rows = cached_database_rows(token, database_id, source_db, Path(args.cache_rows))
+            else:
+                # Schema and first query page are independent; fetch both in one round trip.
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    schema_future = pool.submit(notion_get_cached, f"/databases/{database_id}", token)
+                    first_page_future = pool.submit(
+                        notion_request,
+                        "POST",
+                        f"/databases/{database_id}/query",
+                        token,
+                        {"page_size": QUERY_PAGE_SIZE},
+                    )
+                    schema_props = schema_future.result().get("properties") or {}
+                    first_page = first_page_future.result()
+                rows = iter_database_rows(token, database_id, first_page=first_page)
+            output = args.output or f"notion_db_output.{args.format}"
+            if args.format == "none":
+                print(f"Rows: {sum(1 for _ in rows)}")
+            elif args.format == "jsonl":
+                if output == "-":
+                    count = write_jsonl(rows, data_out.buffer)
+                else:
+                    with open(output, "wb") as fh:
+                        count = write_jsonl(rows, fh)
+                print(f"Wrote {count} JSONL rows: {output}", file=sys.stderr)
+            elif args.format == "csv":
+                if output == "-":
+                    count = write_csv(rows, schema_props, data_out)
+                else:
+                    with open(output, "w", newline="", encoding="utf-8") as fh:
+                        count = write_csv(rows, schema_props, fh)
+                print(f"Wrote {count} CSV rows: {output}", file=sys.stderr)
+            else:
+                try:
+                    import pandas as pd  # type: ignore
+                except ImportError:
+                    print("Pandas not available; install it to get a DataFrame output.")
+                    return 1
+                columns = collect_flat_columns(rows, schema_props)
+                df = pd.DataFrame(columns, copy=False)
+                print("\nDataFrame preview:")
+                print(df.to_string(index=False))
+                write_xlsx(df, output)
+                print(f"Wrote XLSX: {output}")
 
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
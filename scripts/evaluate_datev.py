@@ -6,19 +6,84 @@ from __future__ import annotations
 import argparse
 import csv
 import json
-from collections import Counter
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional faster JSON codec
+    orjson = None
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+BELEGINFO_ART_COLUMNS = tuple(f"Beleginfo-Art {i}" for i in range(1, 9))
+BELEGINFO_INHALT_COLUMNS = tuple(f"Beleginfo-Inhalt {i}" for i in range(1, 9))
+BOOKING_COLUMNS = frozenset(
+    [
+        "Umsatz",
+        "Soll-/Haben-Kennzeichen",
+        "Konto",
+        "Gegenkonto (ohne BU-Schlüssel)",
+        "BU-Schlüssel",
+        "Belegdatum",
+        "Buchungstext",
+        "EU-Mitgliedstaat u. UStID (Bestimmung)",
+        "EU-Steuersatz (Bestimmung)",
+        *BELEGINFO_ART_COLUMNS,
+        *BELEGINFO_INHALT_COLUMNS,
+    ]
+)
+MASTER_COLUMNS = frozenset(
+    [
+        "Konto",
+        "Name (Adressatentyp Unternehmen)",
+        "Name (Adressatentyp natürl. Person)",
+        "Vorname (Adressatentyp natürl. Person)",
+        "Name (Adressatentyp keine Angabe)",
+    ]
+)
+
+
+FEE_PATTERN = re.compile("Gebühr|Fee")
+SIGN_FACTOR = {"S": 1, "H": -1}
+EXTRACTED_FIELDS = [
+    "bu_key",
+    "amount",
+    "sign",
+    "signed_amount",
+    "belegdatum",
+    "month_mm",
+    "konto",
+    "gegenkonto",
+    "buchungstext",
+    "partner_name",
+    "eu_ustid_bestimmung",
+    "eu_steuer_bestimmung",
+    "country_prefix",
+]
+
 
 @dataclass
 class ExtfFile:
     path: Path
     meta: list[str]
-    header: list[str]
-    rows: list[list[str]]
+    frame: pd.DataFrame
+
+    @property
+    def header(self) -> list[str]:
+        return list(self.frame.columns)
 
 
 def parse_args() -> argparse.Namespace:
@@ -73,6 +138,11 @@ def parse_args() -> argparse.Namespace:
         default=Path("data/DATEV/analysis"),
         help="Directory for generated plots and optional extracted CSV.",
     )
+    parser.add_argument(
+        "--plots",
+        action="store_true",
+        help="Render the BU overview PNG into --plots-dir (imports matplotlib).",
+    )
     parser.add_argument(
         "--write-extracted-csv",
         action="store_true",
@@ -97,178 +167,245 @@ def normalize_path(path: Path, base_dir: Path) -> Path:
 
 
 def find_latest_file_by_prefix(datev_dir: Path, prefix: str) -> Path:
-    matches = list(datev_dir.glob(f"{prefix}*.csv"))
+    # One scandir pass; DirEntry caches the stat result, so each file is stat'ed once.
+    with os.scandir(datev_dir) as entries:
+        matches = [
+            (entry.stat().st_mtime, entry.name, entry.path)
+            for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(".csv") and entry.is_file()
+        ]
     if not matches:
         raise FileNotFoundError(f"No files matching prefix {prefix!r} in {datev_dir}")
-    matches.sort(key=lambda path: (path.stat().st_mtime, path.name))
-    return matches[-1]
+    return Path(max(matches)[2])
+
+
+def _read_extf_arrow(path: Path, encoding: str, header: list[str], names: list[str]) -> pd.DataFrame:
+    # Memory-mapped input and Arrow's multi-threaded C++ parser; all columns stay in Arrow
+    # for the blank-row check and only ``names`` are converted to pandas.
+    with pa.memory_map(str(path), "r") as source:
+        table = pa_csv.read_csv(
+            source,
+            read_options=pa_csv.ReadOptions(encoding=encoding, skip_rows=1),
+            parse_options=pa_csv.ParseOptions(delimiter=";", newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+            ),
+        )
+    non_blank = pa.array(np.zeros(table.num_rows, dtype=bool))
+    for values in table.columns:
+        stripped = pc.utf8_trim(pc.utf8_trim_whitespace(values), characters='"')
+        non_blank = pc.or_(non_blank, pc.fill_null(pc.not_equal(stripped, ""), False))
+    return table.filter(non_blank).select(names).to_pandas()
 
 
-def read_extf(path: Path, encoding: str) -> ExtfFile:
+def _strip_cells(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.fillna("").apply(lambda col: col.str.strip().str.strip('"'))
+
+
+def read_extf(path: Path, encoding: str, columns: frozenset[str] | None = None) -> ExtfFile:
+    """Read an EXTF export; ``columns`` limits the returned frame to the named header fields.
+
+    Blank rows are detected across all columns before narrowing, so a row that only has
+    content outside ``columns`` is still kept.
+    """
     with path.open("r", encoding=encoding, newline="") as handle:
         reader = csv.reader(handle, delimiter=";")
         meta = next(reader)
-        header = next(reader)
-        rows = [row for row in reader if any((col or "").strip() for col in row)]
-    return ExtfFile(path=path, meta=meta, header=header, rows=rows)
-
-
-def money_to_decimal(raw: str) -> Decimal:
-    value = (raw or "").strip().replace(".", "").replace(",", ".")
-    if not value:
-        return Decimal("0")
-    try:
-        return Decimal(value)
-    except InvalidOperation:
-        return Decimal("0")
-
-
-def row_get(row: list[str], index_map: dict[str, int], column: str) -> str:
-    idx = index_map.get(column)
-    if idx is None or idx >= len(row):
-        return ""
-    return row[idx].strip().strip('"')
-
-
-def parse_country_prefix(ustid: str) -> str:
-    cleaned = (ustid or "").replace(" ", "").upper()
-    if len(cleaned) < 2:
-        return ""
-    prefix = cleaned[:2]
-    return prefix if prefix.isalpha() else ""
-
-
-def summarize_amounts(rows: list[list[str]], idx: dict[str, int]) -> dict[str, str]:
-    total_s = Decimal("0")
-    total_h = Decimal("0")
-    for row in rows:
-        amount = money_to_decimal(row_get(row, idx, "Umsatz"))
-        sign = row_get(row, idx, "Soll-/Haben-Kennzeichen")
-        if sign == "S":
-            total_s += amount
-        elif sign == "H":
-            total_h += amount
-    return {
-        "debit_S_total": str(total_s),
-        "credit_H_total": str(total_h),
-        "net_S_minus_H": str(total_s - total_h),
-    }
+        header = next(reader, [])
+    names = [name for name in header if columns is None or name in columns]
+    frame = None
+    if pa is not None and len(set(header)) == len(header):
+        try:
+            frame = _read_extf_arrow(path, encoding, header, names)
+        except pa.ArrowInvalid:
+            pass  # ragged rows; pandas pads short rows instead of failing
+    if frame is None:
+        frame = _strip_cells(
+            pd.read_csv(
+                path,
+                sep=";",
+                encoding=encoding,
+                skiprows=1,
+                dtype=str,
+                keep_default_na=False,
+                engine="c",
+            )
+        )
+        # Trailing ";;;;" lines parse as all-empty rows; drop them like csv.reader callers did.
+        frame = frame[frame.ne("").any(axis=1)]
+        if columns is not None:
+            frame = frame.loc[:, frame.columns.isin(columns)]
+    else:
+        # Strip padding and stray quotes once here so column() is a plain lookup.
+        frame = _strip_cells(frame)
+    return ExtfFile(path=path, meta=meta, frame=frame.reset_index(drop=True))
 
 
-def signed_amount(amount: Decimal, sign: str) -> Decimal:
-    if sign == "S":
-        return amount
-    if sign == "H":
-        return -amount
-    return Decimal("0")
-
-
-def booking_partner_name(row: list[str], bookings_idx: dict[str, int]) -> str:
-    for i in range(1, 9):
-        art = row_get(row, bookings_idx, f"Beleginfo-Art {i}")
-        inhalt = row_get(row, bookings_idx, f"Beleginfo-Inhalt {i}")
-        if art == "Name" and inhalt:
-            return inhalt
-    return ""
-
-
-def extract_bu_rows(
-    rows: list[list[str]],
-    bookings_idx: dict[str, int],
-    bu_keys: set[str],
-) -> list[dict[str, Any]]:
-    extracted: list[dict[str, Any]] = []
-    for row in rows:
-        bu_key = row_get(row, bookings_idx, "BU-Schlüssel")
-        if bu_key not in bu_keys:
-            continue
-        amount = money_to_decimal(row_get(row, bookings_idx, "Umsatz"))
-        sign = row_get(row, bookings_idx, "Soll-/Haben-Kennzeichen")
-        ustid_best = row_get(row, bookings_idx, "EU-Mitgliedstaat u. UStID (Bestimmung)")
-        extracted.append(
-            {
-                "bu_key": bu_key,
-                "amount": str(amount),
-                "sign": sign,
-                "signed_amount": str(signed_amount(amount, sign)),
-                "belegdatum": row_get(row, bookings_idx, "Belegdatum"),
-                "month_mm": row_get(row, bookings_idx, "Belegdatum")[2:4]
-                if len(row_get(row, bookings_idx, "Belegdatum")) == 4
-                else "",
-                "konto": row_get(row, bookings_idx, "Konto"),
-                "gegenkonto": row_get(row, bookings_idx, "Gegenkonto (ohne BU-Schlüssel)"),
-                "buchungstext": row_get(row, bookings_idx, "Buchungstext"),
-                "partner_name": booking_partner_name(row, bookings_idx),
-                "eu_ustid_bestimmung": ustid_best,
-                "eu_steuer_bestimmung": row_get(row, bookings_idx, "EU-Steuersatz (Bestimmung)"),
-                "country_prefix": parse_country_prefix(ustid_best),
-            }
-        )
-    return extracted
-
-
-def summarize_extracted_amounts(extracted: list[dict[str, Any]]) -> dict[str, str]:
-    total_s = Decimal("0")
-    total_h = Decimal("0")
-    for row in extracted:
-        amount = Decimal(row["amount"])
-        sign = row["sign"]
-        if sign == "S":
-            total_s += amount
-        elif sign == "H":
-            total_h += amount
+def money_to_cents(raw: pd.Series) -> pd.Series:
+    """Parse DATEV amounts like ``1.234,50`` into int64 cents; unparsable values become 0."""
+    value = pd.to_numeric(
+        raw.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+        errors="coerce",
+    )
+    # Amounts carry two decimals, so rounding value * 100 is exact well beyond any Umsatz.
+    return (value.where(np.isfinite(value), 0) * 100).round().astype("int64")
+
+
+def format_cents(cents: int) -> str:
+    euros, rest = divmod(abs(int(cents)), 100)
+    return f"{'-' if cents < 0 else ''}{euros}.{rest:02d}"
+
+
+def column(frame: pd.DataFrame, name: str) -> pd.Series:
+    if name not in frame.columns:
+        return pd.Series("", index=frame.index, dtype=object)
+    return frame[name]
+
+
+def country_prefix(ustid: str) -> str:
+    prefix = ustid.replace(" ", "").upper()[:2]
+    return prefix if len(prefix) == 2 and prefix.isalpha() else ""
+
+
+def parse_country_prefix(ustid: pd.Series) -> pd.Series:
+    # Few distinct UStIDs repeat across many bookings: parse each once and scatter by code.
+    codes, uniques = pd.factorize(ustid)
+    prefixes = np.array([country_prefix(value) for value in uniques], dtype=object)
+    return pd.Series(prefixes[codes], index=ustid.index, dtype=object)
+
+
+def top_counts(values: pd.Series, top_n: int | None = None) -> list[tuple[str, int]]:
+    # First-occurrence order plus keep="first"/stable sorting matches Counter.most_common on ties.
+    counts = values.value_counts(sort=False)
+    if top_n is None:
+        counts = counts.sort_values(ascending=False, kind="stable")
+    else:
+        counts = counts.nlargest(top_n, keep="first")
+    return [(key, int(count)) for key, count in counts.items()]
+
+
+def format_totals(total_s: int, total_h: int) -> dict[str, str]:
     return {
-        "debit_S_total": str(total_s),
-        "credit_H_total": str(total_h),
-        "net_S_minus_H": str(total_s - total_h),
+        "debit_S_total": format_cents(total_s),
+        "credit_H_total": format_cents(total_h),
+        "net_S_minus_H": format_cents(total_s - total_h),
     }
 
 
+def summarize_amounts(bookings: pd.DataFrame) -> dict[str, str]:
+    cents = bookings["cents"]
+    sign = bookings["sign"]
+    return format_totals(int(cents[sign == "S"].sum()), int(cents[sign == "H"].sum()))
+
+
+def signed_amount(cents: pd.Series, sign: pd.Series) -> pd.Series:
+    return cents * sign.map(SIGN_FACTOR).fillna(0).astype("int64")
+
+
+def beleginfo_names(frame: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """Scan the eight Beleginfo slots once.
+
+    Returns the first "Name" entry per row (the booking partner) and every
+    "Name" entry in row-major order, i.e. the order a per-row loop sees them.
+    """
+    arts = np.column_stack([column(frame, name).to_numpy() for name in BELEGINFO_ART_COLUMNS])
+    inhalte = np.column_stack([column(frame, name).to_numpy() for name in BELEGINFO_INHALT_COLUMNS])
+    is_name = (arts == "Name") & (inhalte != "")
+    first = inhalte[np.arange(len(inhalte)), is_name.argmax(axis=1)]
+    partner = pd.Series(np.where(is_name.any(axis=1), first, ""), index=frame.index, dtype=object)
+    return partner, pd.Series(inhalte[is_name], dtype=object)
+
+
+def prepare_bookings(frame: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """Derive every per-row field evaluate needs from the raw EXTF columns, once.
+
+    The second value holds all Beleginfo "Name" entries for the name ranking.
+    """
+    partner, names = beleginfo_names(frame)
+    cents = money_to_cents(column(frame, "Umsatz"))
+    sign = column(frame, "Soll-/Haben-Kennzeichen")
+    belegdatum = column(frame, "Belegdatum")
+    ustid_best = column(frame, "EU-Mitgliedstaat u. UStID (Bestimmung)")
+    prepared = pd.DataFrame(
+        {
+            "bu_key": column(frame, "BU-Schlüssel"),
+            "cents": cents,
+            "sign": sign,
+            "signed_cents": signed_amount(cents, sign),
+            "belegdatum": belegdatum,
+            "month_mm": belegdatum.str[2:4].where(belegdatum.str.len().eq(4), ""),
+            "konto": column(frame, "Konto"),
+            "gegenkonto": column(frame, "Gegenkonto (ohne BU-Schlüssel)"),
+            "buchungstext": column(frame, "Buchungstext"),
+            "partner_name": partner,
+            "eu_ustid_bestimmung": ustid_best,
+            "eu_steuer_bestimmung": column(frame, "EU-Steuersatz (Bestimmung)"),
+            "country_prefix": parse_country_prefix(ustid_best),
+        }
+    )
+    return prepared, names
+
+
+def extract_bu_rows(bookings: pd.DataFrame, bu_keys: set[str]) -> pd.DataFrame:
+    return bookings[bookings["bu_key"].isin(bu_keys)]
+
+
+def extracted_records(extracted: pd.DataFrame) -> pd.DataFrame:
+    """Materialise the output columns, with amounts formatted, for the CSV and JSON preview."""
+    return extracted.assign(
+        amount=extracted["cents"].map(format_cents),
+        signed_amount=extracted["signed_cents"].map(format_cents),
+    )[EXTRACTED_FIELDS]
+
+
+def group_sum(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sum ``values`` per distinct key; returns the sorted keys and their int64 totals."""
+    uniques, codes = np.unique(keys, return_inverse=True)
+    return uniques, np.bincount(codes, weights=values, minlength=len(uniques)).astype(np.int64)
+
+
 def plot_extracted_bu_rows(
-    extracted: list[dict[str, Any]],
+    extracted: pd.DataFrame,
     plots_dir: Path,
     top_n: int,
     extract_bu_keys: set[str],
 ) -> list[str]:
-    if not extracted:
+    if extracted.empty:
         return []
 
+    import matplotlib
+
+    matplotlib.use("Agg")  # file output only; skip interactive backend probing
     import matplotlib.pyplot as plt
 
     plots_dir.mkdir(parents=True, exist_ok=True)
     created_files: list[str] = []
 
-    by_bu = Counter(row["bu_key"] for row in extracted)
-    by_partner = Counter(row["partner_name"] for row in extracted if row["partner_name"])
-    by_country = Counter(
-        row["country_prefix"] for row in extracted if row["country_prefix"] and row["country_prefix"] != "DE"
-    )
-    by_konto_abs_sum: dict[str, Decimal] = {}
-    month_bu_net: dict[tuple[str, str], Decimal] = {}
-
-    for row in extracted:
-        konto = row["konto"]
-        amount = Decimal(row["amount"])
-        sign = row["sign"]
-        signed = signed_amount(amount, sign)
-        month = row["month_mm"] or "??"
-        bu = row["bu_key"]
-        month_bu_net[(month, bu)] = month_bu_net.get((month, bu), Decimal("0")) + signed
-        if konto:
-            by_konto_abs_sum[konto] = by_konto_abs_sum.get(konto, Decimal("0")) + abs(signed)
+    partner = extracted["partner_name"]
+    country = extracted["country_prefix"]
+    signed = extracted["signed_cents"].to_numpy()
+    kontos = extracted["konto"].to_numpy()
+    has_konto = kontos != ""
+    konto_keys, konto_abs_sums = group_sum(kontos[has_konto], np.abs(signed[has_konto]))
+    by_konto_abs_sum = dict(zip(konto_keys, konto_abs_sums.tolist()))
+
+    # (month, BU) net sums via one flattened key: month_code * len(keys) + bu_code.
+    months, month_codes = np.unique(extracted["month_mm"].replace("", "??").to_numpy(), return_inverse=True)
+    keys, bu_codes = np.unique(extracted["bu_key"].to_numpy(), return_inverse=True)
+    month_bu_net = np.bincount(
+        month_codes * len(keys) + bu_codes, weights=signed, minlength=len(months) * len(keys)
+    ).reshape(len(months), len(keys))
 
     fig, axes = plt.subplots(2, 2, figsize=(16, 10))
 
     # 1) Monthly net amount per BU key
     ax = axes[0, 0]
-    months = sorted({m for m, _ in month_bu_net.keys()})
-    keys = sorted(by_bu.keys())
-    x = list(range(len(months)))
+    x = np.arange(len(months))
     width = 0.8 / max(1, len(keys))
+    offsets = (np.arange(len(keys)) - (len(keys) - 1) / 2) * width
+    net_euros = month_bu_net / 100
     for idx_key, key in enumerate(keys):
-        vals = [float(month_bu_net.get((m, key), Decimal("0"))) for m in months]
-        xpos = [val + (idx_key - (len(keys) - 1) / 2) * width for val in x]
-        ax.bar(xpos, vals, width=width, label=f"BU {key}")
+        ax.bar(x + offsets[idx_key], net_euros[:, idx_key], width=width, label=f"BU {key}")
     ax.set_xticks(x)
     ax.set_xticklabels(months)
     ax.set_title("Net Umsatz by Month and BU-Key")
@@ -279,7 +416,7 @@ def plot_extracted_bu_rows(
 
     # 2) Top partner names
     ax = axes[0, 1]
-    partner_items = by_partner.most_common(top_n)
+    partner_items = top_counts(partner[partner != ""], top_n)
     labels = [item[0] for item in partner_items]
     values = [item[1] for item in partner_items]
     if labels:
@@ -291,7 +428,7 @@ def plot_extracted_bu_rows(
     ax = axes[1, 0]
     konto_items = sorted(by_konto_abs_sum.items(), key=lambda item: item[1], reverse=True)[:top_n]
     labels = [item[0] for item in konto_items]
-    values = [float(item[1]) for item in konto_items]
+    values = [item[1] / 100 for item in konto_items]
     if labels:
         ax.bar(labels, values)
         ax.tick_params(axis="x", rotation=45)
@@ -300,14 +437,14 @@ def plot_extracted_bu_rows(
 
     # 4) Country split + BU count annotation
     ax = axes[1, 1]
-    country_items = by_country.most_common(top_n)
+    country_items = top_counts(country[(country != "") & (country != "DE")], top_n)
     labels = [item[0] for item in country_items]
     values = [item[1] for item in country_items]
     if labels:
         ax.bar(labels, values)
     ax.set_title("Non-DE Country Prefixes (UStID Bestimmung)")
     ax.set_ylabel("Count")
-    annotation = ", ".join([f"{key}:{count}" for key, count in sorted(by_bu.items())])
+    annotation = ", ".join([f"{key}:{count}" for key, count in zip(keys, np.bincount(bu_codes))])
     ax.text(0.01, 0.95, f"BU counts: {annotation}", transform=ax.transAxes, va="top", fontsize=10)
 
     fig.tight_layout()
@@ -328,126 +465,68 @@ def evaluate(
     extract_bu_keys: set[str],
     plots_dir: Path,
     write_extracted_csv: bool,
+    make_plots: bool = False,
 ) -> dict[str, Any]:
-    bookings_idx = {name: i for i, name in enumerate(bookings.header)}
-    master_idx = {name: i for i, name in enumerate(master.header)}
-
-    total_s = Decimal("0")
-    total_h = Decimal("0")
-    by_month = Counter()
-    by_konto = Counter()
-    by_gegenkonto = Counter()
-    by_text = Counter()
-    by_name = Counter()
-    fee_like_rows = 0
-
-    for row in bookings.rows:
-        amount = money_to_decimal(row_get(row, bookings_idx, "Umsatz"))
-        sign = row_get(row, bookings_idx, "Soll-/Haben-Kennzeichen")
-        if sign == "S":
-            total_s += amount
-        elif sign == "H":
-            total_h += amount
-
-        belegdatum = row_get(row, bookings_idx, "Belegdatum")
-        if len(belegdatum) == 4 and belegdatum.isdigit():
-            by_month[belegdatum[2:4]] += 1
-
-        konto = row_get(row, bookings_idx, "Konto")
-        gegenkonto = row_get(row, bookings_idx, "Gegenkonto (ohne BU-Schlüssel)")
-        text = row_get(row, bookings_idx, "Buchungstext")
-
-        if konto:
-            by_konto[konto] += 1
-        if gegenkonto:
-            by_gegenkonto[gegenkonto] += 1
-        if text:
-            by_text[text] += 1
-            if "Gebühr" in text or "Fee" in text:
-                fee_like_rows += 1
-
-        for i in range(1, 9):
-            art = row_get(row, bookings_idx, f"Beleginfo-Art {i}")
-            inhalt = row_get(row, bookings_idx, f"Beleginfo-Inhalt {i}")
-            if art == "Name" and inhalt:
-                by_name[inhalt] += 1
-
-    extracted_rows = extract_bu_rows(bookings.rows, bookings_idx, extract_bu_keys)
-    extracted_summaries = summarize_extracted_amounts(extracted_rows)
-    plot_files = plot_extracted_bu_rows(
-        extracted_rows,
-        plots_dir=plots_dir,
-        top_n=top_n,
-        extract_bu_keys=extract_bu_keys,
+    df = bookings.frame
+    prepared, name_entries = prepare_bookings(df)
+    konto = prepared["konto"]
+    gegenkonto = prepared["gegenkonto"]
+    text = prepared["buchungstext"]
+    month = prepared["month_mm"]
+
+    month_ok = month.ne("") & prepared["belegdatum"].str.isdigit()
+    fee_like = text.str.contains(FEE_PATTERN)
+
+    extracted = extract_bu_rows(prepared, extract_bu_keys)
+    plot_files = (
+        plot_extracted_bu_rows(
+            extracted,
+            plots_dir=plots_dir,
+            top_n=top_n,
+            extract_bu_keys=extract_bu_keys,
+        )
+        if make_plots
+        else []
     )
     extracted_csv_path = None
-    if write_extracted_csv and extracted_rows:
+    if write_extracted_csv and not extracted.empty:
         plots_dir.mkdir(parents=True, exist_ok=True)
         key_suffix = "_".join(sorted(extract_bu_keys))
         extracted_csv_path = plots_dir / f"bu_{key_suffix}_rows.csv"
-        with extracted_csv_path.open("w", encoding="utf-8", newline="") as handle:
-            fieldnames = list(extracted_rows[0].keys())
-            writer = csv.DictWriter(handle, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(extracted_rows)
-
-    master_accounts: list[str] = []
-    master_names: list[str] = []
-    for row in master.rows:
-        konto = row_get(row, master_idx, "Konto")
-        name_company = row_get(row, master_idx, "Name (Adressatentyp Unternehmen)")
-        name_person = row_get(row, master_idx, "Name (Adressatentyp natürl. Person)")
-        firstname_person = row_get(row, master_idx, "Vorname (Adressatentyp natürl. Person)")
-        name_unknown = row_get(row, master_idx, "Name (Adressatentyp keine Angabe)")
-        name = name_company or " ".join([firstname_person, name_person]).strip() or name_unknown
-        if konto:
-            master_accounts.append(konto)
-        master_names.append(name)
+        extracted_records(extracted).to_csv(
+            extracted_csv_path, index=False, encoding="utf-8", lineterminator="\r\n"
+        )
+
+    mf = master.frame
+    master_konto = column(mf, "Konto")
+    name_company = column(mf, "Name (Adressatentyp Unternehmen)")
+    name_person = (
+        column(mf, "Vorname (Adressatentyp natürl. Person)")
+        + " "
+        + column(mf, "Name (Adressatentyp natürl. Person)")
+    ).str.strip()
+    name_unknown = column(mf, "Name (Adressatentyp keine Angabe)")
+    master_names = name_company.where(name_company != "", name_person)
+    master_names = master_names.where(master_names != "", name_unknown).tolist()
+    master_accounts = master_konto[master_konto != ""].tolist()
 
     set_master = set(master_accounts)
-    set_booking_konto = {
-        row_get(row, bookings_idx, "Konto")
-        for row in bookings.rows
-        if row_get(row, bookings_idx, "Konto")
-    }
-    set_booking_gegenkonto = {
-        row_get(row, bookings_idx, "Gegenkonto (ohne BU-Schlüssel)")
-        for row in bookings.rows
-        if row_get(row, bookings_idx, "Gegenkonto (ohne BU-Schlüssel)")
-    }
-    set_booking_accounts = set_booking_konto | set_booking_gegenkonto
+    # Hash-dedupe both account columns in one pass before building the (small) Python set.
+    set_booking_accounts = set(pd.unique(np.concatenate([konto.to_numpy(), gegenkonto.to_numpy()])))
+    set_booking_accounts.discard("")
 
     # iGL candidates:
     # 1) broad: non-DE UStID in EU-Mitgliedstaat/UStID (Bestimmung)
     # 2) tax0: broad + EU-Steuersatz (Bestimmung)=0
     # 3) strict: tax0 + BU-Schlüssel in configured keys
-    rows_igl_non_de: list[list[str]] = []
-    rows_igl_tax0: list[list[str]] = []
-    rows_igl_strict: list[list[str]] = []
-    countries_non_de = Counter()
-    countries_tax0 = Counter()
-    countries_strict = Counter()
-
-    for row in bookings.rows:
-        ustid = row_get(row, bookings_idx, "EU-Mitgliedstaat u. UStID (Bestimmung)")
-        eu_tax_rate = row_get(row, bookings_idx, "EU-Steuersatz (Bestimmung)")
-        bu_key = row_get(row, bookings_idx, "BU-Schlüssel")
-        country = parse_country_prefix(ustid)
-        is_non_de = bool(country) and country != "DE"
-
-        if not is_non_de:
-            continue
-
-        rows_igl_non_de.append(row)
-        countries_non_de[country] += 1
-
-        if eu_tax_rate == "0":
-            rows_igl_tax0.append(row)
-            countries_tax0[country] += 1
-
-            if bu_key in igl_bu_keys:
-                rows_igl_strict.append(row)
-                countries_strict[country] += 1
+    country = prepared["country_prefix"]
+    is_non_de = (country != "") & (country != "DE")
+    is_tax0 = is_non_de & (prepared["eu_steuer_bestimmung"] == "0")
+    is_strict = is_tax0 & prepared["bu_key"].isin(igl_bu_keys)
+
+    extracted_partner = extracted["partner_name"]
+    extracted_konto = extracted["konto"]
+    extracted_country = extracted["country_prefix"]
 
     return {
         "input": {
@@ -456,20 +535,18 @@ def evaluate(
         },
         "bookings": {
             "meta_type": bookings.meta[3] if len(bookings.meta) > 3 else "",
-            "rows": len(bookings.rows),
-            "debit_S_total": str(total_s),
-            "credit_H_total": str(total_h),
-            "net_S_minus_H": str(total_s - total_h),
-            "top_konto": by_konto.most_common(top_n),
-            "top_gegenkonto": by_gegenkonto.most_common(top_n),
-            "top_month_mm": by_month.most_common(),
-            "top_booking_text": by_text.most_common(top_n),
-            "fee_like_rows": fee_like_rows,
-            "top_names_in_beleginfo": by_name.most_common(top_n),
+            "rows": len(df),
+            **summarize_amounts(prepared),
+            "top_konto": top_counts(konto[konto != ""], top_n),
+            "top_gegenkonto": top_counts(gegenkonto[gegenkonto != ""], top_n),
+            "top_month_mm": top_counts(month[month_ok]),
+            "top_booking_text": top_counts(text[text != ""], top_n),
+            "fee_like_rows": int(fee_like.sum()),
+            "top_names_in_beleginfo": top_counts(name_entries, top_n),
         },
         "master_data": {
             "meta_type": master.meta[3] if len(master.meta) > 3 else "",
-            "rows": len(master.rows),
+            "rows": len(mf),
             "konto_unique": len(set_master),
             "konto_min": min(master_accounts) if master_accounts else None,
             "konto_max": max(master_accounts) if master_accounts else None,
@@ -488,40 +565,36 @@ def evaluate(
                 f"strict=tax0 + BU-Schlüssel in {sorted(igl_bu_keys)}"
             ),
             "broad_non_de_ustid": {
-                "rows": len(rows_igl_non_de),
-                **summarize_amounts(rows_igl_non_de, bookings_idx),
-                "top_country_prefix": countries_non_de.most_common(top_n),
+                "rows": int(is_non_de.sum()),
+                **summarize_amounts(prepared[is_non_de]),
+                "top_country_prefix": top_counts(country[is_non_de], top_n),
             },
             "tax0_non_de_ustid": {
-                "rows": len(rows_igl_tax0),
-                **summarize_amounts(rows_igl_tax0, bookings_idx),
-                "top_country_prefix": countries_tax0.most_common(top_n),
+                "rows": int(is_tax0.sum()),
+                **summarize_amounts(prepared[is_tax0]),
+                "top_country_prefix": top_counts(country[is_tax0], top_n),
             },
             "strict_with_bu_key": {
-                "rows": len(rows_igl_strict),
-                **summarize_amounts(rows_igl_strict, bookings_idx),
-                "top_country_prefix": countries_strict.most_common(top_n),
+                "rows": int(is_strict.sum()),
+                **summarize_amounts(prepared[is_strict]),
+                "top_country_prefix": top_counts(country[is_strict], top_n),
                 "bu_keys": sorted(igl_bu_keys),
             },
         },
         "bu_key_extract": {
             "keys": sorted(extract_bu_keys),
-            "rows": len(extracted_rows),
-            **extracted_summaries,
-            "by_bu_key": Counter(row["bu_key"] for row in extracted_rows).most_common(top_n),
-            "by_sign": Counter(row["sign"] for row in extracted_rows).most_common(),
-            "top_partner_names": Counter(
-                row["partner_name"] for row in extracted_rows if row["partner_name"]
-            ).most_common(top_n),
-            "top_konto": Counter(row["konto"] for row in extracted_rows if row["konto"]).most_common(top_n),
-            "top_country_prefix_non_de": Counter(
-                row["country_prefix"]
-                for row in extracted_rows
-                if row["country_prefix"] and row["country_prefix"] != "DE"
-            ).most_common(top_n),
+            "rows": len(extracted),
+            **summarize_amounts(extracted),
+            "by_bu_key": top_counts(extracted["bu_key"], top_n),
+            "by_sign": top_counts(extracted["sign"]),
+            "top_partner_names": top_counts(extracted_partner[extracted_partner != ""], top_n),
+            "top_konto": top_counts(extracted_konto[extracted_konto != ""], top_n),
+            "top_country_prefix_non_de": top_counts(
+                extracted_country[(extracted_country != "") & (extracted_country != "DE")], top_n
+            ),
             "plots": plot_files,
             "extracted_csv": str(extracted_csv_path) if extracted_csv_path else None,
-            "preview": extracted_rows[: min(20, len(extracted_rows))],
+            "preview": extracted_records(extracted.head(20)).to_dict("records"),
         },
     }
 
@@ -551,6 +624,12 @@ def build_display_result(result: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def dump_json(data: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
 def main() -> int:
     args = parse_args()
     datev_dir = args.datev_dir.resolve()
@@ -566,8 +645,12 @@ def main() -> int:
         else find_latest_file_by_prefix(datev_dir, "EXTF_GP_Stamm_")
     )
 
-    bookings = read_extf(bookings_path, args.encoding)
-    master = read_extf(master_path, args.encoding)
+    # The two exports are independent; Arrow's parser releases the GIL, so read them side by side.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bookings_future = executor.submit(read_extf, bookings_path, args.encoding, BOOKING_COLUMNS)
+        master_future = executor.submit(read_extf, master_path, args.encoding, MASTER_COLUMNS)
+        bookings = bookings_future.result()
+        master = master_future.result()
     igl_bu_keys = {key.strip() for key in args.igl_bu_keys.split(",") if key.strip()}
     result = evaluate(
         bookings=bookings,
@@ -577,20 +660,22 @@ def main() -> int:
         extract_bu_keys={key.strip() for key in args.extract_bu_keys.split(",") if key.strip()},
         plots_dir=args.plots_dir,
         write_extracted_csv=args.write_extracted_csv,
+        make_plots=args.plots,
     )
     display_result = build_display_result(result)
+    display_json = dump_json(display_result)
 
     if args.output:
         args.output.parent.mkdir(parents=True, exist_ok=True)
-        args.output.write_text(json.dumps(display_result, ensure_ascii=False, indent=2), encoding="utf-8")
+        args.output.write_text(display_json, encoding="utf-8")
 
     if args.json:
-        print(json.dumps(display_result, ensure_ascii=False, indent=2))
+        print(display_json)
     else:
         print_text_summary(display_result)
         print("")
         print("Full JSON")
-        print(json.dumps(display_result, ensure_ascii=False, indent=2))
+        print(display_json)
 
     return 0
 
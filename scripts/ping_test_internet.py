@@ -1,17 +1,59 @@
+import contextlib
 import csv
+import functools
+import http.client
+import itertools
+import os
+import random
+import re
+import select
+import socket
+import ssl
+import struct
 import subprocess
+import threading
 import time
-import socket
+import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
+from pathlib import Path
+
 import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None
 
 # --------------------------------------------------------------
-# 1) Monitoring-Funktion: Ping-Messungen in CSV loggen
+# 1) Monitoring-Funktion: Ping-Messungen in CSV/Parquet loggen
 # --------------------------------------------------------------
 
+FLUSH_EVERY = 32  # Logzeilen zwischen zwei flush()-Aufrufen
+PARQUET_ROW_GROUP = 4096  # Zeilen je Parquet-Row-Group (kleinere Gruppen blähen die Metadaten auf)
+LOG_COLUMNS = (
+    "timestamp",
+    "gateway_latency_ms",
+    "gateway_packet_loss",
+    "public_latency_ms",
+    "public_packet_loss",
+    "dns_lookup_ms",
+    "dns_failed",
+    "https_latency_ms",
+    "https_failed",
+)
+LATENCY_COLUMNS = ("gateway_latency_ms", "public_latency_ms", "dns_lookup_ms", "https_latency_ms", "latency_ms")
+FLAG_COLUMNS = ("gateway_packet_loss", "public_packet_loss", "dns_failed", "https_failed")
+
+
 def get_default_gateway():
     """Try to detect the default gateway on macOS/Linux."""
     # macOS: route -n get default | grep gateway
@@ -47,17 +89,122 @@ def get_default_gateway():
     return None
 
 
-def dns_lookup_ms(domain):
+def system_nameserver():
+    """Erster nameserver-Eintrag aus /etc/resolv.conf (None, wenn keiner gefunden)."""
+    try:
+        with open("/etc/resolv.conf") as fh:
+            for line in fh:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1]
+    except OSError:
+        pass
+    return None
+
+
+def _dns_query(domain, server, timeout=5.0):
+    """Schickt eine A-Anfrage per UDP direkt an ``server``; True bei Antwort mit Treffern."""
+    query_id = random.getrandbits(16)
+    labels = domain.rstrip(".").split(".")
+    question = b"".join(bytes([len(part)]) + part for part in (label.encode("idna") for label in labels))
+    packet = (
+        struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)  # RD-Flag, eine Frage
+        + question
+        + b"\0"
+        + struct.pack("!HH", 1, 1)  # QTYPE A, QCLASS IN
+    )
+    family = socket.AF_INET6 if ":" in server else socket.AF_INET
+    with socket.socket(family, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect((server, 53))
+        sock.send(packet)
+        while True:
+            data = sock.recv(4096)
+            if len(data) >= 12 and struct.unpack("!H", data[:2])[0] == query_id:
+                break
+    flags, _, answers = struct.unpack("!HHH", data[2:8])
+    return flags & 0x000F == 0 and answers > 0
+
+
+def dns_lookup_ms(domain, server=None):
+    """Misst die Antwortzeit des DNS-Servers.
+
+    Mit ``server`` wird der Resolver direkt gefragt (kein libc/nscd-Cache dazwischen);
+    ohne Server bleibt es beim System-getaddrinfo.
+    """
     start = time.perf_counter()
     try:
-        socket.getaddrinfo(domain, 443)
+        if server:
+            if not _dns_query(domain, server):
+                return None, 1
+        else:
+            socket.getaddrinfo(domain, 443)
         elapsed = (time.perf_counter() - start) * 1000
         return elapsed, 0
     except Exception:
         return None, 1
 
 
+class HttpsProbe:
+    """Hält eine HTTPS-Verbindung offen (keep-alive) und baut sie nur nach Fehlern neu auf.
+
+    So misst jeder Tick die eigentliche Request-Zeit und nicht jedes Mal TCP- und
+    TLS-Handshake. Fehlgeschlagene Requests und HTTP-Status ab 400 zählen wie bisher
+    als Ausfall; Weiterleitungen folgt wie bisher ``urlopen``.
+    """
+
+    def __init__(self, url, timeout=5):
+        parsed = urllib.parse.urlsplit(url)
+        self.url = url
+        self.host = parsed.hostname
+        self.port = parsed.port or 443
+        self.path = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        self.timeout = timeout
+        self._context = ssl.create_default_context()
+        self._conn = None
+
+    def _get(self):
+        if self._conn is None:
+            self._conn = http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=self._context
+            )
+        self._conn.request("GET", self.path)
+        response = self._conn.getresponse()
+        response.read()  # vollständig lesen, sonst ist die Verbindung nicht wiederverwendbar
+        if response.will_close:
+            self.close()
+        return response.status
+
+    def request_ms(self):
+        for attempt in range(2):
+            reused = self._conn is not None
+            start = time.perf_counter()
+            try:
+                status = self._get()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Server hat die Keep-alive-Verbindung im Leerlauf geschlossen: einmal neu versuchen.
+                self.close()
+                if not reused or attempt:
+                    return None, 1
+            except Exception:
+                self.close()
+                return None, 1
+        if status >= 400:
+            return None, 1
+        if status >= 300:
+            return https_request_ms(self.url)
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, 0
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
 def https_request_ms(url):
+    """Kalte Messung: neue Verbindung inkl. TCP- und TLS-Handshake pro Aufruf."""
     start = time.perf_counter()
     try:
         with urllib.request.urlopen(url, timeout=5) as response:
@@ -68,42 +215,109 @@ def https_request_ms(url):
         return None, 1
 
 
+class CsvLog:
+    """Schreibt Logzeilen als CSV; explizites flush nur alle FLUSH_EVERY Zeilen."""
+
+    def __init__(self, logfile):
+        self._file = open(logfile, "w", newline="", buffering=1 << 16)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(LOG_COLUMNS)
+        self._rows = 0
+
+    def write(self, row):
+        self._writer.writerow((row[0].isoformat(), *row[1:]))
+        self._rows += 1
+        if self._rows % FLUSH_EVERY == 0:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetLog:
+    """Schreibt Logzeilen als Parquet: Latenzen float32, Flags int8, Zeitstempel in ms.
+
+    Die Zeilen werden gesammelt und blockweise als Row Group geschrieben; lesbar ist
+    die Datei erst nach close(), das run_monitoring auch bei Ctrl+C aufruft.
+    """
+
+    def __init__(self, logfile):
+        if pa is None:
+            raise RuntimeError("Für --format parquet wird pyarrow benötigt.")
+        fields = [pa.field("timestamp", pa.timestamp("ms"))]
+        for name in LOG_COLUMNS[1:]:
+            fields.append(pa.field(name, pa.float32() if name in LATENCY_COLUMNS else pa.int8()))
+        self.schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(logfile, self.schema)
+        self._pending = []
+
+    def write(self, row):
+        self._pending.append(row)
+        if len(self._pending) >= PARQUET_ROW_GROUP:
+            self._write_pending()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        columns = [
+            pa.array(values, type=field.type)
+            for values, field in zip(zip(*self._pending), self.schema)
+        ]
+        self._writer.write_batch(pa.record_batch(columns, schema=self.schema))
+        self._pending = []
+
+    def close(self):
+        try:
+            self._write_pending()
+        finally:
+            self._writer.close()
+
+
+LOG_WRITERS = {"csv": CsvLog, "parquet": ParquetLog}
+
+
 def run_monitoring(
     public_target="8.8.8.8",
     gateway_target=None,
     dns_domain="google.com",
+    dns_server=None,
     https_url="https://www.google.com/generate_204",
+    https_cold=False,
     interval=2,
     duration_hours=6,
-    logfile="ping_log.csv"
+    logfile="ping_log.csv",
+    log_format="csv"
 ):
     num_tests = int((duration_hours * 3600) / interval)
     if gateway_target is None:
         gateway_target = get_default_gateway()
+    if dns_server is None:
+        dns_server = system_nameserver()
+    if https_cold:
+        https_probe = functools.partial(https_request_ms, https_url)
+    else:
+        https_probe = HttpsProbe(https_url).request_ms
 
-    with open(logfile, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "timestamp",
-            "gateway_latency_ms",
-            "gateway_packet_loss",
-            "public_latency_ms",
-            "public_packet_loss",
-            "dns_lookup_ms",
-            "dns_failed",
-            "https_latency_ms",
-            "https_failed"
-        ])
-
+    # Die vier Messungen sind I/O-gebunden: parallel starten, damit ein Tick
+    # so lange dauert wie die langsamste Messung statt wie ihre Summe.
+    # Beim Abbruch (auch Ctrl+C) schreibt das with-Statement den Rest beim Schließen raus.
+    log = LOG_WRITERS[log_format](logfile)
+    with contextlib.closing(log), ThreadPoolExecutor(max_workers=4) as executor:
         for _ in range(num_tests):
-            timestamp = datetime.now().isoformat()
-            gateway_latency = ping_once(gateway_target) if gateway_target else None
-            public_latency = ping_once(public_target)
-            dns_ms, dns_failed = dns_lookup_ms(dns_domain)
-            https_ms, https_failed = https_request_ms(https_url)
-
-            writer.writerow([
-                timestamp,
+            tick_start = time.perf_counter()
+            now = datetime.now()
+            timestamp = now.isoformat()
+            gateway_future = executor.submit(ping_once, gateway_target)
+            public_future = executor.submit(ping_once, public_target)
+            dns_future = executor.submit(dns_lookup_ms, dns_domain, dns_server)
+            https_future = executor.submit(https_probe)
+            gateway_latency = gateway_future.result()
+            public_latency = public_future.result()
+            dns_ms, dns_failed = dns_future.result()
+            https_ms, https_failed = https_future.result()
+
+            log.write((
+                now,
                 gateway_latency,
                 1 if gateway_latency is None else 0,
                 public_latency,
@@ -112,7 +326,7 @@ def run_monitoring(
                 dns_failed,
                 https_ms,
                 https_failed
-            ])
+            ))
 
             status = []
             if gateway_latency is None:
@@ -133,50 +347,168 @@ def run_monitoring(
                 status.append(f"HTTPS {int(https_ms)} ms")
             print(timestamp, "|", ", ".join(status))
 
-            time.sleep(interval)
+            # Konstanter Tick-Abstand: nur die Restzeit des Intervalls schlafen.
+            time.sleep(max(0.0, interval - (time.perf_counter() - tick_start)))
+
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class IcmpPinger:
+    """Echo-Requests über langlebige ICMP-Sockets statt eines ping-Prozesses je Messung.
+
+    Nutzt unprivilegierte SOCK_DGRAM-ICMP-Sockets (Linux: net.ipv4.ping_group_range,
+    macOS), sonst SOCK_RAW (root). Jeder Thread bekommt einen eigenen Socket mit
+    eigener Kennung, parallele Pings stören sich also nicht.
+    """
+
+    def __init__(self, timeout=2.0):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._seq = itertools.count(1)
+        self._ident = itertools.count(os.getpid())
+
+    def _socket(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+                self._local.raw = False
+            except PermissionError:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+                self._local.raw = True
+            self._local.ident = next(self._ident) & 0xFFFF
+            self._local.sock = sock
+        return sock
+
+    def ping(self, target):
+        sock = self._socket()
+        # Raw-Sockets sehen alle ICMP-Antworten des Hosts; bei DGRAM setzt der Kernel die ID selbst.
+        raw = self._local.raw
+        ident = self._local.ident
+        seq = next(self._seq) & 0xFFFF
+        payload = b"neckar-wave-ping"
+        header = struct.pack("!BBHHH", 8, 0, 0, ident, seq)
+        packet = struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload), ident, seq) + payload
+
+        start = time.perf_counter()
+        sock.sendto(packet, (target, 0))
+        deadline = start + self.timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([sock], [], [], remaining)
+            if not ready:
+                return None
+            data = sock.recv(1024)
+            if data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4:]  # macOS liefert den IP-Header mit
+            # Echo Reply (Typ 0) mit unserer Sequenznummer; ältere, verspätete Antworten verwerfen.
+            if len(data) < 8 or data[0] != 0:
+                continue
+            reply_ident, reply_seq = struct.unpack("!HH", data[4:8])
+            if reply_seq == seq and (not raw or reply_ident == ident):
+                return round((time.perf_counter() - start) * 1000, 3)
+
+
+_PINGER = IcmpPinger()
+_PING_TIME_RE = re.compile(rb"time[=<]([\d.]+)")
+_icmp_available = True
 
 
 def ping_once(target):
     """Sendet einen Ping und extrahiert die Latenz."""
+    global _icmp_available
     if not target:
         return None
-    result = subprocess.run(
-        ["ping", "-c", "1", target],
-        capture_output=True,
-        text=True
-    )
+    if _icmp_available:
+        try:
+            return _PINGER.ping(target)
+        except PermissionError:
+            # ICMP-Sockets nicht erlaubt (ping_group_range): auf das ping-Binary ausweichen
+            _icmp_available = False
+        except OSError:
+            return None
+    return _ping_subprocess(target)
+
+
+def _ping_subprocess(target):
+    # -n: keine Rückwärtsauflösung; Ausgabe als Bytes, nur die Zeit per Regex herausziehen
+    result = subprocess.run(["ping", "-n", "-c", "1", target], capture_output=True)
     if result.returncode != 0:
         return None
 
-    for line in result.stdout.split("\n"):
-        if "time=" in line:
-            try:
-                return float(line.split("time=")[1].split(" ")[0])
-            except:
-                return None
-    return None
+    match = _PING_TIME_RE.search(result.stdout)
+    return float(match.group(1)) if match else None
 
 
 # --------------------------------------------------------------
 # 2) Visualisieren: Mehrere Plots erzeugen
 # --------------------------------------------------------------
 
-def plot_results(logfile="ping_log.csv", output_path=None):
-    df = pd.read_csv(logfile)
+def load_log(logfile):
+    """Liest das Ping-Log mit festen, schmalen Spaltentypen (Latenzen float32, Flags int8)."""
+    if str(logfile).endswith(".parquet"):
+        if pa is None:
+            raise RuntimeError("Zum Lesen von Parquet-Logs wird pyarrow benötigt.")
+        return pq.read_table(logfile).to_pandas(self_destruct=True)
+    if pa is not None:
+        column_types = {"timestamp": pa.timestamp("ns")}
+        column_types.update({name: pa.float32() for name in LATENCY_COLUMNS})
+        column_types.update({name: pa.int8() for name in FLAG_COLUMNS})
+        try:
+            table = pa_csv.read_csv(
+                logfile, convert_options=pa_csv.ConvertOptions(column_types=column_types)
+            )
+        except pa.ArrowInvalid:
+            pass  # unerwartetes Format, z.B. Zeitzonen-Offsets: pandas parst toleranter
+        else:
+            return table.to_pandas(self_destruct=True)
+    dtype = {name: "float32" for name in LATENCY_COLUMNS}
+    dtype.update({name: "Int8" for name in FLAG_COLUMNS})
+    return pd.read_csv(logfile, dtype=dtype, parse_dates=["timestamp"])
+
+
+# Dichte Kurven vor dem Zeichnen auf sichtbare Pixel ausdünnen (Standard-Schwelle ist 1/9).
+PLOT_RC = {"path.simplify": True, "path.simplify_threshold": 1.0}
+LINE_STYLE = {"rasterized": True, "linewidth": 0.6}
 
-    # Zeitspalte konvertieren
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+
+def plot_results(logfile="ping_log.csv", output_path=None):
+    df = load_log(logfile)
 
     analyze_results(df)
 
-    fig, axes = plt.subplots(3, 1, figsize=(12, 9), sharex=True)
+    with plt.rc_context(PLOT_RC):
+        _plot_figures(df, output_path)
+
+
+def _new_figure(figsize, output_path):
+    """Mit output_path eine eigenständige Agg-Figure (ohne pyplot-Registry), sonst pyplot fürs Fenster."""
+    if not output_path:
+        return plt.figure(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _plot_figures(df, output_path):
+    fig = _new_figure((12, 9), output_path)
+    axes = fig.subplots(3, 1, sharex=True)
 
     # Plot 1: Latenz über Zeit (Gateway + Public)
     ax = axes[0]
     if "gateway_latency_ms" in df.columns:
-        ax.plot(df["timestamp"], df["gateway_latency_ms"], marker=".", linestyle="-", label="Gateway", alpha=0.8)
+        ax.plot(df["timestamp"], df["gateway_latency_ms"], marker=".", linestyle="-", label="Gateway", alpha=0.8, **LINE_STYLE)
     if "public_latency_ms" in df.columns:
-        ax.plot(df["timestamp"], df["public_latency_ms"], marker=".", linestyle="-", label="Public", alpha=0.8)
+        ax.plot(df["timestamp"], df["public_latency_ms"], marker=".", linestyle="-", label="Public", alpha=0.8, **LINE_STYLE)
     ax.set_title("Latenz über Zeit")
     ax.set_ylabel("Latenz (ms)")
     ax.legend()
@@ -185,9 +517,9 @@ def plot_results(logfile="ping_log.csv", output_path=None):
     # Plot 2: Paketverlust über Zeit
     ax = axes[1]
     if "gateway_packet_loss" in df.columns:
-        ax.plot(df["timestamp"], df["gateway_packet_loss"], color="orange", linestyle="--", label="Gateway")
+        ax.plot(df["timestamp"], df["gateway_packet_loss"], color="orange", linestyle="--", label="Gateway", **LINE_STYLE)
     if "public_packet_loss" in df.columns:
-        ax.plot(df["timestamp"], df["public_packet_loss"], color="red", linestyle="--", label="Public")
+        ax.plot(df["timestamp"], df["public_packet_loss"], color="red", linestyle="--", label="Public", **LINE_STYLE)
     ax.set_title("Paketverlust über Zeit")
     ax.set_ylabel("Paketverlust (0/1)")
     ax.legend()
@@ -196,9 +528,9 @@ def plot_results(logfile="ping_log.csv", output_path=None):
     # Plot 3: DNS + HTTPS Latenzen
     ax = axes[2]
     if "dns_lookup_ms" in df.columns:
-        ax.plot(df["timestamp"], df["dns_lookup_ms"], color="blue", linestyle="-", label="DNS")
+        ax.plot(df["timestamp"], df["dns_lookup_ms"], color="blue", linestyle="-", label="DNS", **LINE_STYLE)
     if "https_latency_ms" in df.columns:
-        ax.plot(df["timestamp"], df["https_latency_ms"], color="green", linestyle="-", label="HTTPS")
+        ax.plot(df["timestamp"], df["https_latency_ms"], color="green", linestyle="-", label="HTTPS", **LINE_STYLE)
     ax.set_title("DNS/HTTPS Latenzen")
     ax.set_xlabel("Zeit")
     ax.set_ylabel("Latenz (ms)")
@@ -214,9 +546,13 @@ def plot_results(logfile="ping_log.csv", output_path=None):
     fig.tight_layout()
 
     # Plot 4: Histogramm der Public-Latenzen (separate figure)
-    valid_latencies = df["public_latency_ms"].dropna() if "public_latency_ms" in df.columns else df["latency_ms"].dropna()
-    fig_hist, ax_hist = plt.subplots(figsize=(8, 4))
-    ax_hist.hist(valid_latencies, bins=40)
+    latency_col = "public_latency_ms" if "public_latency_ms" in df.columns else "latency_ms"
+    valid_latencies = df[latency_col].to_numpy(dtype=np.float64)
+    valid_latencies = valid_latencies[~np.isnan(valid_latencies)]
+    counts, edges = np.histogram(valid_latencies, bins=40)
+    fig_hist = _new_figure((8, 4), output_path)
+    ax_hist = fig_hist.subplots()
+    ax_hist.bar(edges[:-1], counts, width=np.diff(edges), align="edge", rasterized=True)
     ax_hist.set_title("Verteilung der Latenzen (Public)")
     ax_hist.set_xlabel("Latenz (ms)")
     ax_hist.set_ylabel("Häufigkeit")
@@ -224,9 +560,16 @@ def plot_results(logfile="ping_log.csv", output_path=None):
     fig_hist.tight_layout()
 
     if output_path:
-        fig.savefig(output_path, dpi=150)
-        hist_path = output_path.replace(".png", "_hist.png")
-        fig_hist.savefig(hist_path, dpi=150)
+        output_file = Path(output_path)
+        hist_path = output_file.with_name(f"{output_file.stem}_hist{output_file.suffix}")
+        # Beide Plots parallel rendern/komprimieren; die Figures teilen keinen Zustand.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            saves = [
+                executor.submit(fig.savefig, output_path, dpi=150),
+                executor.submit(fig_hist.savefig, hist_path, dpi=150),
+            ]
+        for save in saves:
+            save.result()
     else:
         plt.show()
 
@@ -247,28 +590,35 @@ def analyze_results(df):
     }
     for col, label in loss_cols.items():
         if col in df.columns:
-            count = int(df[col].sum())
+            count = int(np.nansum(df[col].to_numpy(dtype=np.float64, na_value=np.nan)))
             if count > 0:
                 issues.append(f"{label}: {count}/{rows} ({(count/rows)*100:.1f}%)")
 
     # Detect large time gaps vs median sampling interval
     if "timestamp" in df.columns:
-        deltas = df["timestamp"].sort_values().diff().dt.total_seconds().dropna()
+        timestamps = np.sort(df["timestamp"].to_numpy(dtype="datetime64[ns]"))
+        timestamps = timestamps[~np.isnat(timestamps)]
+        deltas = np.diff(timestamps) / np.timedelta64(1, "s")
         if len(deltas) > 0:
-            median_interval = deltas.median()
+            median_interval = float(np.median(deltas))
             gap_threshold = max(median_interval * 2.5, median_interval + 5)
-            gap_count = int((deltas > gap_threshold).sum())
+            gap_count = int(np.count_nonzero(deltas > gap_threshold))
             if gap_count > 0:
                 issues.append(f"Sampling gaps: {gap_count} gaps > {gap_threshold:.1f}s")
 
     # Latency spikes (public) using a robust threshold
     if "public_latency_ms" in df.columns:
-        lat = df["public_latency_ms"].dropna()
+        lat = df["public_latency_ms"].to_numpy(dtype=np.float64)
+        lat = lat[~np.isnan(lat)]
         if len(lat) > 0:
-            median = lat.median()
-            mad = (lat - median).abs().median()
+            # np.median partitioniert bereits (O(n)); lat/dev sind eigene Kopien, die
+            # Reihenfolge ist danach egal, also ohne weitere Kopie in-place partitionieren.
+            median = float(np.median(lat, overwrite_input=True))
+            dev = np.subtract(lat, median)
+            np.abs(dev, out=dev)
+            mad = float(np.median(dev, overwrite_input=True))
             spike_threshold = median + max(3 * mad, 50)
-            spike_count = int((lat > spike_threshold).sum())
+            spike_count = int(np.count_nonzero(lat > spike_threshold))
             if spike_count > 0:
                 issues.append(f"Public latency spikes: {spike_count} samples > {spike_threshold:.1f} ms")
 
@@ -295,13 +645,31 @@ if __name__ == "__main__":
     monitor_parser.add_argument("--public-target", default="8.8.8.8")
     monitor_parser.add_argument("--gateway", default=None)
     monitor_parser.add_argument("--dns-domain", default="google.com")
+    monitor_parser.add_argument(
+        "--dns-server",
+        default=None,
+        help="DNS-Server, der direkt abgefragt wird (Standard: erster nameserver aus /etc/resolv.conf)",
+    )
     monitor_parser.add_argument("--https-url", default="https://www.google.com/generate_204")
+    monitor_parser.add_argument(
+        "--https-cold",
+        action="store_true",
+        help="HTTPS jedes Mal mit neuer Verbindung messen (inkl. Handshake) statt keep-alive",
+    )
     monitor_parser.add_argument("--interval", type=int, default=2, help="Seconds between tests")
     monitor_parser.add_argument("--duration-hours", type=float, default=6)
-    monitor_parser.add_argument("--logfile", default="ping_log.csv")
+    monitor_parser.add_argument(
+        "--logfile", default=None, help="Standard: ping_log.csv bzw. ping_log.parquet"
+    )
+    monitor_parser.add_argument(
+        "--format",
+        choices=sorted(LOG_WRITERS),
+        default="csv",
+        help="Logformat; parquet speichert float32/int8-Spalten (benötigt pyarrow)",
+    )
 
     plot_parser = subparsers.add_parser("plot", help="Plot results from a logfile")
-    plot_parser.add_argument("--logfile", default="ping_log.csv")
+    plot_parser.add_argument("--logfile", default="ping_log.csv", help="CSV- oder .parquet-Log")
     plot_parser.add_argument("--output", default=None)
 
     args = parser.parse_args()
@@ -311,10 +679,13 @@ if __name__ == "__main__":
             public_target=args.public_target,
             gateway_target=args.gateway,
             dns_domain=args.dns_domain,
+            dns_server=args.dns_server,
             https_url=args.https_url,
+            https_cold=args.https_cold,
             interval=args.interval,
             duration_hours=args.duration_hours,
-            logfile=args.logfile
+            logfile=args.logfile or f"ping_log.{args.format}",
+            log_format=args.format
         )
     elif args.command == "plot":
         plot_results(logfile=args.logfile, output_path=args.output)
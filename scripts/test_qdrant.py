@@ -1,34 +1,118 @@
 #!/usr/bin/env python3
+import http.client
 import json
 import os
 import sys
 import urllib.error
-import urllib.request
+import urllib.parse
 
+import numpy as np
 
-def request_json(
-    method: str, url: str, payload: dict | None = None, timeout: int = 5
-):
-    data = None
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+UPSERT_BATCH_SIZE = 512
+
+# One keep-alive connection per (scheme, host, port), reused by every call.
+_connections: dict[tuple[str, str, int | None], http.client.HTTPConnection] = {}
+
+
+def _dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=np.ndarray.tolist).encode("utf-8")
+
+
+def _loads(body: bytes):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body.decode("utf-8"))
+
+
+def _connection(parts: urllib.parse.SplitResult, timeout: int) -> http.client.HTTPConnection:
+    key = (parts.scheme, parts.hostname, parts.port)
+    conn = _connections.get(key)
+    if conn is None:
+        if parts.scheme == "https":
+            conn = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+        _connections[key] = conn
+    return conn
+
+
+def _drop_connection(parts: urllib.parse.SplitResult) -> None:
+    conn = _connections.pop((parts.scheme, parts.hostname, parts.port), None)
+    if conn is not None:
+        conn.close()
+
+
+def request(
+    method: str, url: str, data: bytes | None = None, timeout: int = 5
+) -> tuple[int, bytes]:
+    """Send a request over the shared connection; raise HTTPError/URLError like urlopen."""
+    parts = urllib.parse.urlsplit(url)
+    path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
     headers = {"Content-Type": "application/json"}
-    if payload is not None:
-        data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
+    for attempt in range(2):
+        reused = (parts.scheme, parts.hostname, parts.port) in _connections
+        conn = _connection(parts, timeout)
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            resp = conn.getresponse()
             body = resp.read()
-            if not body:
-                return None
-            return json.loads(body.decode("utf-8"))
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode("utf-8") if exc.fp else ""
+            break
+        except (
+            http.client.RemoteDisconnected,
+            ConnectionResetError,
+            BrokenPipeError,
+        ) as exc:
+            # The server closed an idle keep-alive connection: retry once on a fresh one.
+            _drop_connection(parts)
+            if not reused or attempt:
+                raise urllib.error.URLError(exc) from exc
+        except (OSError, http.client.HTTPException) as exc:
+            _drop_connection(parts)
+            raise urllib.error.URLError(exc) from exc
+    if resp.will_close:
+        _drop_connection(parts)
+    if resp.status >= 400:
         raise urllib.error.HTTPError(
-            exc.url,
-            exc.code,
-            f"{exc.reason} (body={body})",
-            exc.headers,
-            exc.fp,
-        ) from exc
+            url,
+            resp.status,
+            f"{resp.reason} (body={body.decode('utf-8', 'replace')})",
+            resp.headers,
+            None,
+        )
+    return resp.status, body
+
+
+def request_json(
+    method: str, url: str, payload: dict | bytes | None = None, timeout: int = 5
+):
+    """Send payload (a dict, or an already encoded body) and decode the JSON reply."""
+    data = payload
+    if payload is not None and not isinstance(payload, bytes):
+        data = _dumps(payload)
+    _, body = request(method, url, data, timeout)
+    if not body:
+        return None
+    return _loads(body)
+
+
+def upsert_bodies(ids: np.ndarray, vectors: np.ndarray, labels: list[str]) -> list[bytes]:
+    """Encode the upsert requests once, UPSERT_BATCH_SIZE points per body."""
+    bodies = []
+    for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+        stop = start + UPSERT_BATCH_SIZE
+        points = [
+            {"id": int(point_id), "vector": vector, "payload": {"label": label}}
+            for point_id, vector, label in zip(ids[start:stop], vectors[start:stop], labels[start:stop])
+        ]
+        bodies.append(_dumps({"points": points}))
+    return bodies
 
 
 def main() -> int:
@@ -37,17 +121,17 @@ def main() -> int:
     last_label = "health"
     last_url = health_url
 
-    def call(label: str, method: str, url: str, payload: dict | None = None):
+    def call(label: str, method: str, url: str, payload: dict | bytes | None = None):
         nonlocal last_label, last_url
         last_label = label
         last_url = url
         return request_json(method, url, payload)
 
     try:
-        with urllib.request.urlopen(health_url, timeout=5) as resp:
-            if resp.status != 200:
-                print(f"Unexpected status {resp.status} from {health_url}", file=sys.stderr)
-                return 1
+        status, _ = request("GET", health_url)
+        if status != 200:
+            print(f"Unexpected status {status} from {health_url}", file=sys.stderr)
+            return 1
     except urllib.error.URLError as exc:
         print(f"Failed to reach {health_url}: {exc}", file=sys.stderr)
         return 1
@@ -68,31 +152,34 @@ def main() -> int:
             },
         )
 
-        points = [
-            {"id": 1, "vector": [0.1, 0.2, 0.3, 0.4], "payload": {"label": "alpha"}},
-            {"id": 2, "vector": [0.2, 0.1, 0.0, 0.3], "payload": {"label": "beta"}},
-            {"id": 3, "vector": [0.9, 0.8, 0.7, 0.6], "payload": {"label": "gamma"}},
-        ]
-        call(
-            "upsert_points",
-            "PUT",
-            f"{qdrant_url}/collections/{collection_name}/points?wait=true",
-            {"points": points},
+        # Column layout: one contiguous float32 matrix instead of a list per point.
+        ids = np.arange(1, 4, dtype=np.int64)
+        vectors = np.array(
+            [[0.1, 0.2, 0.3, 0.4], [0.2, 0.1, 0.0, 0.3], [0.9, 0.8, 0.7, 0.6]],
+            dtype=np.float32,
         )
+        labels = ["alpha", "beta", "gamma"]
+        for body in upsert_bodies(ids, vectors, labels):
+            call(
+                "upsert_points",
+                "PUT",
+                f"{qdrant_url}/collections/{collection_name}/points?wait=true",
+                body,
+            )
 
         try:
             retrieve_resp = call(
                 "retrieve_points",
                 "POST",
                 f"{qdrant_url}/collections/{collection_name}/points/retrieve",
-                {"ids": [1, 2, 3], "with_payload": True},
+                {"ids": ids, "with_payload": True},
             )
             retrieved = retrieve_resp.get("result") if retrieve_resp else None
         except urllib.error.HTTPError as exc:
             if exc.code != 404:
                 raise
             retrieved = []
-            for point_id in (1, 2, 3):
+            for point_id in ids.tolist():
                 point_resp = call(
                     "retrieve_point_by_id",
                     "GET",
@@ -109,7 +196,7 @@ def main() -> int:
             "search_points",
             "POST",
             f"{qdrant_url}/collections/{collection_name}/points/search",
-            {"vector": [0.1, 0.2, 0.3, 0.4], "limit": 1, "with_payload": True},
+            {"vector": vectors[0], "limit": 1, "with_payload": True},
         )
         search_result = search_resp.get("result") if search_resp else None
         if not search_result:
@@ -128,7 +215,7 @@ def main() -> int:
             pass
 
     top = search_result[0]
-    print(f"Inserted {len(points)} points and retrieved them successfully.")
+    print(f"Inserted {len(ids)} points and retrieved them successfully.")
     print(f"Search top result id={top.get('id')} payload={top.get('payload')}")
     return 0
 
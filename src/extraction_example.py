@@ -8,21 +8,31 @@ Requirements:
 """
 
 from datetime import date
+from functools import lru_cache
 from typing import List, Optional
 
 from openai import OpenAI
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 # ------------------------------------------------------------------------------
 # 1. Define the schema (this is the contract)
 # ------------------------------------------------------------------------------
 
+# strict: no silent coercion of LLM output (e.g. "3" -> 3); forbid: unknown keys are errors
+# and the schema gets additionalProperties: false.
+STRICT_CONFIG = ConfigDict(strict=True, extra="forbid")
+
+
 class Person(BaseModel):
+    model_config = STRICT_CONFIG
+
     name: str = Field(description="Full name as explicitly mentioned")
     role: Optional[str] = Field(description="Role or title if explicitly stated")
     organization: Optional[str] = Field(description="Organization affiliation if stated")
 
 class Event(BaseModel):
+    model_config = STRICT_CONFIG
+
     title: Optional[str]
     date: Optional[date]
     location: Optional[str]
@@ -57,12 +67,15 @@ client = OpenAI()
 # 4. Tool (function) definition using the schema
 # ------------------------------------------------------------------------------
 
+# Built once; validators are compiled at class creation (pydantic-core), not per call.
+EVENT_SCHEMA = Event.model_json_schema()
+
 TOOLS = [{
     "type": "function",
     "function": {
         "name": "extract_event",
         "description": "Extract an Event object from text",
-        "parameters": Event.model_json_schema(),
+        "parameters": EVENT_SCHEMA,
     }
 }]
 
@@ -72,6 +85,7 @@ TOOLS = [{
 # ------------------------------------------------------------------------------
 
 def extract_once(messages):
+    """Return the forced extract_event tool call (id + JSON arguments)."""
     response = client.chat.completions.create(
         model="gpt-4.1",
         temperature=0,
@@ -82,7 +96,13 @@ def extract_once(messages):
             "function": {"name": "extract_event"}
         }
     )
-    return response.choices[0].message.tool_calls[0].function.arguments
+    return response.choices[0].message.tool_calls[0]
+
+
+@lru_cache(maxsize=32)
+def validate_event(raw_args: str) -> Event:
+    # Identical tool arguments validate to the same Event; failures are not cached.
+    return Event.model_validate_json(raw_args)
 
 
 # ------------------------------------------------------------------------------
@@ -97,33 +117,32 @@ messages = [
 MAX_RETRIES = 2
 
 for attempt in range(MAX_RETRIES + 1):
-    raw_args = extract_once(messages)
+    tool_call = extract_once(messages)
+    raw_args = tool_call.function.arguments
 
     try:
-        event = Event.model_validate_json(raw_args)
+        event = validate_event(raw_args)
         break  # success
     except ValidationError as e:
         if attempt == MAX_RETRIES:
             raise RuntimeError("Extraction failed after retries") from e
 
-        # Ask the model to repair ONLY what is invalid
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": f"""
-The following JSON failed validation:
-
-{raw_args}
-
-Validation error:
-{e}
-
-Fix ONLY the invalid fields.
-Return a corrected version that fully matches the schema.
-"""
-            }
-        ]
+        # Repair turn: answer the invalid tool call with its validation error
+        # instead of re-sending system prompt and text in a fresh conversation.
+        messages.append({
+            "role": "assistant",
+            "tool_calls": [{
+                "id": tool_call.id,
+                "type": "function",
+                "function": {"name": "extract_event", "arguments": raw_args},
+            }],
+        })
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "content": f"ValidationError: {e.errors(include_url=False)}\n"
+                       "Fix ONLY the invalid fields and call extract_event again.",
+        })
 
 
 # ------------------------------------------------------------------------------
@@ -1,4 +1,8 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime
 from typing import Any, Dict, Iterable, List
 
@@ -11,6 +15,9 @@ load_dotenv()
 DEFAULT_DATABASE_ID = "1ea4e28bdf9e8074ba94e2c410731c50"
 DEFAULT_DATE_PROPERTY = os.getenv("NOTION_DATE_PROPERTY", "Date")
 DEFAULT_ORDER_DB_TITLE = os.getenv("NOTION_ORDER_DB_TITLE", "Bestellungen")
+NOTION_MAX_CONCURRENT_REQUESTS = 3
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_RATE_LIMIT_RETRIES = 4
 
 
 class NotionRequestError(RuntimeError):
@@ -20,6 +27,33 @@ class NotionRequestError(RuntimeError):
         self.body = body
 
 
+class _RequestPacer:
+    """Space request starts evenly so bursts stay within Notion's average rate."""
+
+    def __init__(self, rps: float) -> None:
+        self._interval = 1.0 / rps
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_PACER = _RequestPacer(NOTION_REQUESTS_PER_SECOND)
+
+
+def _retry_after_seconds(resp: requests.Response) -> float:
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", 1)))
+    except ValueError:
+        return 1.0
+
+
 def notion_request(
     method: str,
     path: str,
@@ -33,7 +67,13 @@ def notion_request(
         "Content-Type": "application/json",
     }
     url = f"{base_url}{path}"
-    resp = requests.request(method, url, headers=headers, json=payload, timeout=30)
+    # A 429 means the request was not processed, so resending it is safe even for POST.
+    for attempt in range(NOTION_RATE_LIMIT_RETRIES + 1):
+        _PACER.wait()
+        resp = requests.request(method, url, headers=headers, json=payload, timeout=30)
+        if resp.status_code != 429 or attempt == NOTION_RATE_LIMIT_RETRIES:
+            break
+        time.sleep(_retry_after_seconds(resp))
     if not resp.ok:
         raise NotionRequestError(
             f"{method} {path} failed: {resp.status_code} {resp.text}",
@@ -292,46 +332,83 @@ def _select_prop(value: Any) -> Dict[str, Any] | None:
     return {"select": {"name": name}}
 
 
+def _order_properties(order: Dict[str, Any]) -> Dict[str, Any]:
+    properties: Dict[str, Any] = {
+        "Produkt": _title_prop(order.get("Produkt")),
+    }
+    if order.get("Menge") is not None:
+        properties["Menge"] = {"number": order.get("Menge")}
+
+    date_value = _normalize_order_date(order.get("Datum"))
+    if date_value:
+        properties["Datum"] = {"date": {"start": date_value}}
+
+    text_prop = _text_prop(order.get("Notiz/Kunde"))
+    if text_prop:
+        properties["Notiz/Kunde"] = text_prop
+
+    select_prop = _select_prop(order.get("Abgeholt"))
+    if select_prop:
+        properties["Abgeholt"] = select_prop
+
+    text_prop = _text_prop(order.get("Eintragender"))
+    if text_prop:
+        properties["Eintragender"] = text_prop
+
+    select_prop = _select_prop(order.get("Wohin"))
+    if select_prop:
+        properties["Wohin"] = select_prop
+
+    select_prop = _select_prop(order.get("Zahlung"))
+    if select_prop:
+        properties["Zahlung"] = select_prop
+    return properties
+
+
+@dataclass(frozen=True)
+class OrderInsertResult:
+    created: int
+    # (index into the submitted orders, error message) for every order that was not created
+    failed: List[tuple[int, str]] = field(default_factory=list)
+
+
 def insert_orders(
     database_id: str,
     orders: Iterable[Dict[str, Any]],
-) -> int:
+    max_workers: int = NOTION_MAX_CONCURRENT_REQUESTS,
+) -> OrderInsertResult:
     token = os.getenv("NOTION_TOKEN")
     if not token:
         raise RuntimeError("Missing NOTION_TOKEN in environment or .env")
-    count = 0
-    for order in orders:
-        properties: Dict[str, Any] = {
-            "Produkt": _title_prop(order.get("Produkt")),
-        }
-        if order.get("Menge") is not None:
-            properties["Menge"] = {"number": order.get("Menge")}
-
-        date_value = _normalize_order_date(order.get("Datum"))
-        if date_value:
-            properties["Datum"] = {"date": {"start": date_value}}
-
-        text_prop = _text_prop(order.get("Notiz/Kunde"))
-        if text_prop:
-            properties["Notiz/Kunde"] = text_prop
-
-        select_prop = _select_prop(order.get("Abgeholt"))
-        if select_prop:
-            properties["Abgeholt"] = select_prop
-
-        text_prop = _text_prop(order.get("Eintragender"))
-        if text_prop:
-            properties["Eintragender"] = text_prop
-
-        select_prop = _select_prop(order.get("Wohin"))
-        if select_prop:
-            properties["Wohin"] = select_prop
-
-        select_prop = _select_prop(order.get("Zahlung"))
-        if select_prop:
-            properties["Zahlung"] = select_prop
-
-        payload = {"parent": {"database_id": database_id}, "properties": properties}
-        notion_request("POST", "/pages", token, payload)
-        count += 1
-    return count
+    payloads = [
+        {"parent": {"database_id": database_id}, "properties": _order_properties(order)}
+        for order in orders
+    ]
+    if not payloads:
+        return OrderInsertResult(created=0)
+
+    def create_page(payload: Dict[str, Any]) -> str | None:
+        try:
+            notion_request("POST", "/pages", token, payload)
+        except (NotionRequestError, requests.RequestException) as exc:
+            return str(exc)
+        return None
+
+    # Requests are paced by _PACER; the pool only overlaps their round trips. Every
+    # order is attempted, so one failure does not leave the rest half-written.
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(payloads)))) as pool:
+        errors = list(pool.map(create_page, payloads))
+    failed = [(index, error) for index, error in enumerate(errors) if error is not None]
+    return OrderInsertResult(created=len(payloads) - len(failed), failed=failed)
+
+
+def describe_failed_orders(
+    orders: List[Dict[str, Any]], failed: List[tuple[int, str]]
+) -> str:
+    """German summary of the orders insert_orders could not create."""
+    lines = [f"{len(failed)} Bestellungen nicht gespeichert (nur diese erneut senden):"]
+    for index, error in failed:
+        order = orders[index]
+        label = " ".join(str(order.get(key) or "") for key in ("Menge", "Produkt")).strip()
+        lines.append(f"- Bestellung {index + 1} ({label or 'ohne Produkt'}): {error}")
+    return "\n".join(lines)
@@ -12,13 +12,15 @@ from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_valida
 
 from src.app_paths import DATA_DIR
 
+ORDER_TIMEZONE = "Europe/Berlin"
+_UTC_OFFSET_RE = re.compile(r"\d:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|[+-]\d{2}(?::?\d{2})?)$")
+
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "data" / "order_extraction_prompt.json"
 
 DEFAULT_SYSTEM_PROMPT = (
     "Du extrahierst Bestelldaten fuer eine Baeckerei aus bereitgestelltem Inhalt. "
     "Arbeite strikt faktisch: nichts erfinden, nichts raten. "
-    "Nutze ausschliesslich das vorgegebene Tool-Schema und erfasse pro Bestellzeile genau ein Produkt. "
-    "Wenn Information fehlt, nutze Feld-Defaults, sonst null."
+    "Antworte ausschliesslich im vorgegebenen Schema und erfasse pro Bestellzeile genau ein Produkt."
 )
 DEFAULT_IMAGE_USER_PROMPT = (
     "Analysiere das Foto eines handgeschriebenen Bestellzettels "
@@ -238,6 +240,26 @@ def default_output_schema(default_eintragender: str = "") -> dict[str, list[dict
     }
 
 
+def _has_utc_offset(value: Any) -> bool:
+    if isinstance(value, datetime):
+        return value.tzinfo is not None
+    return isinstance(value, str) and bool(_UTC_OFFSET_RE.search(value.strip()))
+
+
+def order_datum_column(orders: list[dict[str, Any]]) -> pd.Series:
+    """Parse the Datum values of all orders in one pass as naive local wall times.
+
+    Values with a UTC offset are converted to Europe/Berlin before the offset is
+    dropped; naive values keep their wall time unchanged.
+    """
+    raw = pd.Series([order.get("Datum") for order in orders], dtype=object).replace("", None)
+    aware = raw.map(_has_utc_offset).astype(bool)
+    parsed = pd.to_datetime(raw, errors="coerce", format="mixed", utc=True)
+    local = parsed.dt.tz_convert(ORDER_TIMEZONE).dt.tz_localize(None)
+    wall = parsed.dt.tz_localize(None).where(~aware, local)
+    return wall.dt.floor("s")
+
+
 def order_field_names() -> list[str]:
     return [field.alias or name for name, field in OrderItem.model_fields.items()]
 
@@ -354,8 +376,7 @@ def build_transcript_user_prompt(transcript_text: str) -> str:
     return (
         "Transkription:\n"
         f"{transcript_text}\n\n"
-        "Hinweis: Es kann mehrere Bestellungen geben. "
-        "Wenn Felder fehlen, nutze die Default-Werte aus der Struktur."
+        "Hinweis: Es kann mehrere Bestellungen geben."
     )
 
 
@@ -1,13 +1,32 @@
 import difflib
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time, timedelta
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover
+    process = None
+
 BERLIN_TIMEZONE = ZoneInfo("Europe/Berlin")
+END_OF_DAY_OFFSET = pd.Timedelta(hours=23, minutes=59, seconds=59)
+NAME_MATCH_CUTOFF = 0.6
+_ISO_DATE_PREFIX_RE = re.compile(r"^\d{4}[-/]\d{1,2}[-/]\d{1,2}")
+_SPAN_SEPARATOR_RE = re.compile(r"\s*(?:→|->|–)\s*")
+_GMT_SUFFIX_RE = re.compile(r"\s*\(GMT[^\)]*\)")
+_TIME_ONLY_RE = re.compile(r"^\d{1,2}:\d{2}")
+_DATE_ONLY_RE = re.compile(r"^[A-Za-z]+\s+\d{1,2},\s+\d{4}$")
+_CLOCK_TIME_RE = re.compile(r"\b\d{1,2}[:.]\d{2}\b")
+_ISO_TIME_RE = re.compile(r"T\d{1,2}:\d{2}")
+_WEEKDAY_SEPARATOR_RE = re.compile(r"\s*[,;/|]\s*|\s+(?:und|and)\s+", flags=re.IGNORECASE)
+_HOUR_MINUTE_RE = re.compile(r"(\d{1,2})(?::|\.)(\d{2})")
+_HOUR_ONLY_RE = re.compile(r"(\d{1,2})")
 NAME_COLUMN_CANDIDATES = ("Name", "Mitarbeiter", "Employee", "Person", "Titel")
 AVAILABILITY_COLUMNS = ("Wann", "Kommentar", "Select", "Name")
 FIXED_SCHEDULE_NAME_COLUMNS = NAME_COLUMN_CANDIDATES
@@ -86,7 +105,7 @@ def _parse_datetime_text(value: object):
     text = str(value).strip()
     if not text:
         return pd.NaT
-    dayfirst = not bool(re.match(r"^\d{4}[-/]\d{1,2}[-/]\d{1,2}", text))
+    dayfirst = not bool(_ISO_DATE_PREFIX_RE.match(text))
     parsed = pd.to_datetime(text, dayfirst=dayfirst, errors="coerce")
     if pd.notna(parsed) and getattr(parsed, "tzinfo", None) is not None:
         parsed = parsed.tz_convert(BERLIN_TIMEZONE).tz_localize(None)
@@ -112,23 +131,23 @@ def parse_wann(wann_str):
     if pd.isna(wann_str):
         return pd.NaT, pd.NaT
     wann_str = str(wann_str)
-    parts = re.split(r"\s*(?:→|->|–)\s*", wann_str, maxsplit=1)
+    parts = _SPAN_SEPARATOR_RE.split(wann_str, maxsplit=1)
     start = parts[0].strip()
     end = parts[1].strip() if len(parts) > 1 else None
     try:
-        start = re.sub(r'\s*\(GMT[^\)]*\)', '', start)
+        start = _GMT_SUFFIX_RE.sub('', start)
         start_time = _parse_datetime_text(start)
     except Exception:
         start_time = pd.NaT
     end_time = pd.NaT
     if end:
-        if re.match(r"^\d{1,2}:\d{2}", end):
+        if _TIME_ONLY_RE.match(end):
             if pd.isna(start_time):
                 return start_time, pd.NaT
             end = f"{start_time.strftime('%B %d, %Y')} {end}"
         else:
-            end = re.sub(r'\s*\(GMT[^\)]*\)', '', end)
-            if re.match(r"^[A-Za-z]+\s+\d{1,2},\s+\d{4}$", end.strip()):
+            end = _GMT_SUFFIX_RE.sub('', end)
+            if _DATE_ONLY_RE.match(end.strip()):
                 try:
                     date_only = _parse_datetime_text(end.strip()).date()
                     end = datetime.combine(date_only, time(23, 59, 59))
@@ -157,50 +176,83 @@ def has_explicit_time_frame(value: Any) -> bool:
     text = str(value).strip()
     if not text:
         return False
-    cleaned = re.sub(r'\s*\(GMT[^\)]*\)', '', text)
-    return bool(re.search(r"\b\d{1,2}[:.]\d{2}\b", cleaned) or re.search(r"T\d{1,2}:\d{2}", cleaned))
+    cleaned = _GMT_SUFFIX_RE.sub('', text)
+    return bool(_CLOCK_TIME_RE.search(cleaned) or _ISO_TIME_RE.search(cleaned))
 
 
 def split_multiday_entries(df):
-    split_rows = []
-    for _, row in df.iterrows():
-        start = row['Start Time']
-        end = row['End Time']
-        if pd.isna(end) or start.date() == end.date():
-            split_rows.append(row)
-            continue
-        current_start = start
-        while current_start.date() < end.date():
-            current_end = datetime.combine(current_start.date(), datetime.max.time()).replace(microsecond=0)
-            new_row = row.copy()
-            new_row['Start Time'] = current_start
-            new_row['End Time'] = current_end
-            split_rows.append(new_row)
-            current_start = current_end + timedelta(seconds=1)
-        new_row = row.copy()
-        new_row['Start Time'] = current_start
-        new_row['End Time'] = end
-        split_rows.append(new_row)
-    return pd.DataFrame(split_rows)
+    start_days = df['Start Time'].dt.normalize()
+    day_counts = (df['End Time'].dt.normalize() - start_days).dt.days
+    counts = day_counts.fillna(0).clip(lower=0).astype(int).to_numpy() + 1
+
+    # One row per covered day: first keeps the original start, last the original end.
+    split = df.iloc[np.repeat(np.arange(len(df)), counts)].copy()
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    is_first = offsets == 0
+    is_last = offsets == np.repeat(counts - 1, counts)
+    days = split['Start Time'].dt.normalize() + pd.to_timedelta(offsets, unit='D')
+    split['Start Time'] = split['Start Time'].where(is_first, days)
+    split['End Time'] = split['End Time'].where(is_last, days + END_OF_DAY_OFFSET)
+    return split
 
 def fill_missing_end_times(df):
-    df = df.copy()
-    df['End Time'] = df.apply(
-        lambda row: datetime.combine(row['Start Time'].date(), time(23, 59, 59)) 
-        if pd.isna(row['End Time']) and pd.notna(row['Start Time']) 
-        else row['End Time'],
-        axis=1
-    )
+    """Fill missing end times with the end of the start day, mutating df in place."""
+    end_of_day = df['Start Time'].dt.normalize() + END_OF_DAY_OFFSET
+    df['End Time'] = df['End Time'].fillna(end_of_day)
     return df
 
 def match_name(name, name_list):
     if pd.isna(name):
         return None
     name = str(name).strip()
-    match = difflib.get_close_matches(name, name_list, n=1, cutoff=0.6)
+    match = difflib.get_close_matches(name, name_list, n=1, cutoff=NAME_MATCH_CUTOFF)
     return match[0] if match else None
 
 
+def _difflib_scores(names: list[str], name_list: list[str]) -> np.ndarray:
+    """difflib ratio matrix with scores below NAME_MATCH_CUTOFF zeroed.
+
+    Candidates go into seq2 in the outer loop so SequenceMatcher builds each
+    candidate's b2j index once instead of once per input name.
+    """
+    scores = np.zeros((len(names), len(name_list)))
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    for col, candidate in enumerate(name_list):
+        matcher.set_seq2(candidate)
+        for row, name in enumerate(names):
+            matcher.set_seq1(name)
+            if (
+                matcher.real_quick_ratio() >= NAME_MATCH_CUTOFF
+                and matcher.quick_ratio() >= NAME_MATCH_CUTOFF
+            ):
+                ratio = matcher.ratio()
+                if ratio >= NAME_MATCH_CUTOFF:
+                    scores[row, col] = ratio
+    return scores
+
+
+def match_names(names, name_list) -> dict[str, str | None]:
+    """Map each distinct stripped name to its closest entry in name_list, or None."""
+    unique_names = list(dict.fromkeys(str(name).strip() for name in names if not pd.isna(name)))
+    if not unique_names or not name_list:
+        return {name: None for name in unique_names}
+    if process is None:
+        scores = _difflib_scores(unique_names, name_list)
+    else:
+        # Full similarity matrix in one C call; fuzz.ratio is the Indel analogue of difflib's ratio.
+        scores = process.cdist(
+            unique_names,
+            name_list,
+            scorer=fuzz.ratio,
+            score_cutoff=NAME_MATCH_CUTOFF * 100,
+        )
+    best_indices = scores.argmax(axis=1)
+    return {
+        name: name_list[best] if scores[row, best] > 0 else None
+        for row, (name, best) in enumerate(zip(unique_names, best_indices))
+    }
+
+
 def _first_non_empty(row: dict[str, Any], candidates: tuple[str, ...]) -> Any:
     for candidate in candidates:
         value = row.get(candidate)
@@ -228,7 +280,7 @@ def _normalize_weekdays(value: Any) -> list[str]:
     if isinstance(value, list):
         raw_days = value
     else:
-        raw_days = re.split(r"\s*[,;/|]\s*|\s+(?:und|and)\s+", str(value), flags=re.IGNORECASE)
+        raw_days = _WEEKDAY_SEPARATOR_RE.split(str(value))
 
     days = []
     for raw_day in raw_days:
@@ -250,14 +302,14 @@ def _parse_fixed_schedule_time(value: Any) -> time | None:
     if not text:
         return None
 
-    time_match = re.search(r"(\d{1,2})(?::|\.)(\d{2})", text)
+    time_match = _HOUR_MINUTE_RE.search(text)
     if time_match:
         hour = int(time_match.group(1))
         minute = int(time_match.group(2))
         if 0 <= hour <= 23 and 0 <= minute <= 59:
             return time(hour, minute)
 
-    hour_match = re.fullmatch(r"(\d{1,2})", text)
+    hour_match = _HOUR_ONLY_RE.fullmatch(text)
     if hour_match:
         hour = int(hour_match.group(1))
         if 0 <= hour <= 23:
@@ -340,33 +392,40 @@ def normalize_fixed_schedule_records(records: list[dict[str, Any]]) -> tuple[dic
 
     return schedules, errors
 
+def _time_offset(value: time) -> pd.Timedelta:
+    return pd.Timedelta(hours=value.hour, minutes=value.minute, seconds=value.second)
+
+
 def generate_fixed_schedule_entries(start_date, end_date, schedule_dict):
-    rows = []
-    current = pd.to_datetime(start_date).date()
-    end = pd.to_datetime(end_date).date()
-    while current <= end:
-        weekday_name = current.strftime('%A')
-        for name, info in schedule_dict.items():
-            if weekday_name in info['days']:
-                start_dt = datetime.combine(current, info['start_time'])
-                end_dt = datetime.combine(current, info['end_time'])
-                rows.append({'Name': name, 'Start Time': start_dt, 'End Time': end_dt, 'new_name': name})
-        current += timedelta(days=1)
-    return pd.DataFrame(rows)
+    output_columns = ['Name', 'Start Time', 'End Time', 'new_name']
+    first_day = pd.to_datetime(start_date).normalize()
+    last_day = pd.to_datetime(end_date).normalize()
+    dates = pd.DataFrame({'date': pd.date_range(first_day, last_day, freq='D')})
+    dates['weekday'] = dates['date'].dt.day_name()
+    schedules = pd.DataFrame(
+        [
+            {
+                'Name': name,
+                'weekday': list(info['days']),
+                'start_offset': _time_offset(info['start_time']),
+                'end_offset': _time_offset(info['end_time']),
+            }
+            for name, info in schedule_dict.items()
+        ],
+        columns=['Name', 'weekday', 'start_offset', 'end_offset'],
+    ).explode('weekday')
+    entries = dates.merge(schedules, on='weekday')
+    entries['Start Time'] = entries['date'] + pd.to_timedelta(entries['start_offset'])
+    entries['End Time'] = entries['date'] + pd.to_timedelta(entries['end_offset'])
+    entries['new_name'] = entries['Name']
+    return entries[output_columns]
 
 def normalize_long_shifts(df, max_hours=10):
-    df = df.copy()
-    def adjust_if_too_long(row):
-        start = row['Start Time']
-        end = row['End Time']
-        if pd.notna(start) and pd.notna(end):
-            duration = (end - start).total_seconds() / 3600
-            if duration > max_hours:
-                new_start = datetime.combine(start.date(), time(10, 0))
-                new_end = datetime.combine(start.date(), time(18, 0))
-                return pd.Series([new_start, new_end])
-        return pd.Series([start, end])
-    df[['Start Time', 'End Time']] = df.apply(adjust_if_too_long, axis=1)
+    """Reset shifts longer than max_hours to 10:00-18:00, mutating df in place."""
+    too_long = (df['End Time'] - df['Start Time']) > pd.Timedelta(hours=max_hours)
+    day = df.loc[too_long, 'Start Time'].dt.normalize()
+    df.loc[too_long, 'Start Time'] = day + pd.Timedelta(hours=10)
+    df.loc[too_long, 'End Time'] = day + pd.Timedelta(hours=18)
     return df
 
 
@@ -388,18 +447,36 @@ def fill_missing_non_fixed_shift_times(
     )
     return df
 
+def dedupe_person_info(person_info) -> list[tuple]:
+    """Keep the first (name, location, task) tuple per name, preserving order."""
+    first_by_name: dict = {}
+    for name, location, task in person_info:
+        first_by_name.setdefault(name, (location, task))
+    return [(name, location, task) for name, (location, task) in first_by_name.items()]
+
+
+def _person_info_frame(person_info) -> pd.DataFrame:
+    return pd.DataFrame(
+        dedupe_person_info(person_info), columns=['new_name', 'Location', 'Task']
+    ).set_index('new_name')
+
+
+def _format_minutes(values: pd.Series) -> np.ndarray:
+    """Format timestamps as 'YYYY-MM-DD HH:MM' with one NumPy cast instead of strftime."""
+    text = np.datetime_as_string(values.to_numpy(dtype='datetime64[m]'))
+    return np.char.replace(text, 'T', ' ') if text.size else text
+
+
 def transform_to_schedule_format(df, person_info):
-    info_lookup = {name: (location, task) for name, location, task in person_info}
-    df_copy = df.copy()
-    df_copy['Date'] = (
-        df_copy['Start Time'].dt.strftime('%Y-%m-%d %H:%M')
-        + ' → '
-        + df_copy['End Time'].dt.strftime('%Y-%m-%d %H:%M')
+    df_copy = df.join(_person_info_frame(person_info), on='new_name')
+    date_text = np.char.add(
+        np.char.add(_format_minutes(df_copy['Start Time']), ' → '),
+        _format_minutes(df_copy['End Time']),
     )
+    has_span = df_copy['Start Time'].notna() & df_copy['End Time'].notna()
+    df_copy['Date'] = pd.Series(date_text, index=df_copy.index, dtype=object).where(has_span)
     df_copy['Name'] = df_copy['new_name']
     df_copy['Employee'] = df_copy['new_name']
-    df_copy['Task'] = df_copy['new_name'].map(lambda name: info_lookup.get(name, (None, None))[1])
-    df_copy['Location'] = df_copy['new_name'].map(lambda name: info_lookup.get(name, (None, None))[0])
     
     # Define base columns for output
     output_columns = ['Name', 'Date', 'Employee', 'Task', 'Location']
@@ -431,14 +508,17 @@ def _prepare_availability_dataframe(availability_data):
             f"{', '.join(AVAILABILITY_COLUMNS)}."
         )
 
-    parsed_spans = df["Wann"].map(parse_wann)
+    parsed_spans = pd.DataFrame(
+        df["Wann"].map(parse_wann).tolist(),
+        index=df.index,
+        columns=["Start Time", "End Time"],
+    )
     df["_has_explicit_time"] = df["Wann"].map(has_explicit_time_frame)
-    df["Start Time"] = parsed_spans.map(lambda value: value[0])
-    df["End Time"] = parsed_spans.map(lambda value: value[1])
+    df["Start Time"] = pd.to_datetime(parsed_spans["Start Time"])
+    df["End Time"] = pd.to_datetime(parsed_spans["End Time"])
 
-    df = df[df["Start Time"].notna()].copy()
-    df = split_multiday_entries(df).reset_index(drop=True)
-    df = fill_missing_end_times(df)
+    df = df[df["Start Time"].notna()]
+    df = split_multiday_entries(df).reset_index(drop=True).pipe(fill_missing_end_times)
     df = df[df["Name"].notna()].copy()
     df["Name"] = df["Name"].astype(str).str.strip()
     df = df[df["Name"] != ""]
@@ -457,37 +537,32 @@ def _filter_by_date_range(df: pd.DataFrame, start_date, end_date) -> pd.DataFram
     return df[in_range].copy()
 
 
+def _write_csv(target: tuple[pd.DataFrame, Path]) -> None:
+    frame, path = target
+    frame.to_csv(path, index=False)
+
+
 def _write_output_files(formatted_df: pd.DataFrame, output_dir):
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    output_files = {}
-    export_path = output_path / "schedule_export.csv"
-    formatted_df.to_csv(export_path, index=False)
-    output_files["export"] = str(export_path)
-
     df_alt = formatted_df[formatted_df["Location"] == "ALT"]
     df_wie = formatted_df[formatted_df["Location"] == "WIE"]
     df_bak = formatted_df[formatted_df["Location"] == "BAK"]
     df_both_locations = pd.concat([df_alt, df_wie], ignore_index=True)
 
-    both_path = output_path / "both_locations.csv"
-    df_both_locations.to_csv(both_path, index=False)
-    output_files["both"] = str(both_path)
-
-    alt_path = output_path / "schedule_ALT.csv"
-    df_alt.to_csv(alt_path, index=False)
-    output_files["alt"] = str(alt_path)
-
-    wie_path = output_path / "schedule_WIE.csv"
-    df_wie.to_csv(wie_path, index=False)
-    output_files["wie"] = str(wie_path)
-
-    bak_path = output_path / "schedule_BAK.csv"
-    df_bak.to_csv(bak_path, index=False)
-    output_files["bak"] = str(bak_path)
+    targets = {
+        "export": (formatted_df, output_path / "schedule_export.csv"),
+        "both": (df_both_locations, output_path / "both_locations.csv"),
+        "alt": (df_alt, output_path / "schedule_ALT.csv"),
+        "wie": (df_wie, output_path / "schedule_WIE.csv"),
+        "bak": (df_bak, output_path / "schedule_BAK.csv"),
+    }
+    # The writes are independent and I/O bound, so overlap them.
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        list(pool.map(_write_csv, targets.values()))
 
-    return output_files
+    return {key: str(path) for key, (_, path) in targets.items()}
 
 
 def generate_schichtplan(availability_data, start_date, end_date, person_info, fixed_schedules=None, output_dir="Schichtplan"):
@@ -505,11 +580,13 @@ def generate_schichtplan(availability_data, start_date, end_date, person_info, f
     original_unique_names = df["Name"].dropna().str.strip().unique()
 
     # Create name lists for matching
+    person_info = dedupe_person_info(person_info)
     name_list = [name for name, _, _ in person_info]
     person_info_names = set(name_list)
 
     # Match names and filter
-    df["new_name"] = df["Name"].apply(lambda n: match_name(n, name_list))
+    name_matches = match_names(original_unique_names, name_list)
+    df["new_name"] = df["Name"].str.strip().map(name_matches)
     matched_names = set(df["new_name"].dropna().unique())
     df = df[df["new_name"].notna()]
     df = fill_missing_non_fixed_shift_times(df)
@@ -538,9 +615,7 @@ def generate_schichtplan(availability_data, start_date, end_date, person_info, f
     names_not_in_csv = person_info_names - unique_names_set
 
     # Names that couldn't be matched (too different from person_info)
-    unmatched_names = unique_names_set - {
-        name for name in original_unique_names if match_name(name, name_list) is not None
-    }
+    unmatched_names = {name for name in unique_names_set if name_matches.get(name) is None}
 
     evaluation = {
         "names_in_csv_not_in_person_info": sorted(list(names_not_in_person_info)),
@@ -1,5 +1,6 @@
 import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from urllib.parse import parse_qs, urlparse
 
@@ -7,13 +8,33 @@ import pandas as pd
 import requests
 import streamlit as st
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from requests.utils import parse_header_links
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
 ACCESS_TOKEN = os.getenv("SHOPIFY_KEY")
 SHOP_NAME = "suedseitecoffee"  # e.g., 'my-store'
 API_VERSION = "2024-01"
+ORDERS_PAGE_LIMIT = 250
+
+ORDER_META = [
+    "id",
+    "created_at",
+    "total_price",
+    "financial_status",
+    "fulfillment_status",
+    ["customer", "first_name"],
+    ["customer", "last_name"],
+]
+ORDER_META_COLUMNS = [
+    "order." + (".".join(field) if isinstance(field, list) else field)
+    for field in ORDER_META
+]
+LINE_ITEM_COLUMNS = ["title", "variant_title", "variant_id", "sku", "quantity", "price"]
+
+_session: requests.Session | None = None
 
 
 def get_last_friday_4pm() -> str:
@@ -29,25 +50,100 @@ def get_last_friday_4pm() -> str:
     return last_friday.isoformat()
 
 
-def get_last_6_days_orders() -> pd.DataFrame:
-    url = f"https://{SHOP_NAME}.myshopify.com/admin/api/{API_VERSION}/orders.json"
-    last_friday_4pm = get_last_friday_4pm()
+def _shopify_session() -> requests.Session:
+    """Shared session: pooled keep-alive connections, retries on 429/5xx."""
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.headers.update(
+            {
+                "X-Shopify-Access-Token": ACCESS_TOKEN,
+                "Content-Type": "application/json",
+            }
+        )
+        _session = session
+    return _session
 
-    params = {"status": "any", "created_at_min": last_friday_4pm, "limit": 250}
 
-    headers = {
-        "X-Shopify-Access-Token": ACCESS_TOKEN,
-        "Content-Type": "application/json",
-    }
+def _next_page_info(link_header: str | None) -> str | None:
+    """Extract the page_info cursor of the rel="next" link, if any."""
+    if not link_header:
+        return None
+    parsed_links = parse_header_links(link_header.rstrip(">").replace(">,", ">, "))
+    next_link = next((link for link in parsed_links if link.get("rel") == "next"), None)
+    if not next_link or not next_link.get("url"):
+        return None
+    query = parse_qs(urlparse(next_link["url"]).query)
+    return query.get("page_info", [None])[0]
+
 
-    response = requests.get(url, headers=headers, params=params)
+def _fetch_orders_page(
+    session: requests.Session, url: str, params: dict
+) -> requests.Response:
+    response = session.get(url, params=params)
 
     if response.status_code != 200:
         raise Exception(
             f"Error fetching orders: {response.status_code} - {response.text}"
         )
 
-    orders = response.json().get("orders", [])
+    return response
+
+
+def _fetch_orders(params: dict) -> list[dict]:
+    """
+    Fetch all orders matching params, following the Link header pagination.
+
+    The next page is requested as soon as the current response's headers are
+    in, so decoding the JSON body overlaps with the next round trip.
+    """
+    url = f"https://{SHOP_NAME}.myshopify.com/admin/api/{API_VERSION}/orders.json"
+    session = _shopify_session()
+
+    orders = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(_fetch_orders_page, session, url, params)
+        while pending is not None:
+            response = pending.result()
+            next_page_info = _next_page_info(response.headers.get("Link"))
+            pending = None
+            if next_page_info:
+                next_params = {"limit": ORDERS_PAGE_LIMIT, "page_info": next_page_info}
+                pending = executor.submit(_fetch_orders_page, session, url, next_params)
+            orders.extend(response.json().get("orders", []))
+
+    return orders
+
+
+def format_created_at(created_at: pd.Series) -> pd.Series:
+    """Format ISO timestamps as "DD.MM.YYYY HH:MM" in the shop's own UTC offset."""
+    return (
+        created_at.str[8:10]
+        + "."
+        + created_at.str[5:7]
+        + "."
+        + created_at.str[:4]
+        + " "
+        + created_at.str[11:16]
+    )
+
+
+def get_last_6_days_orders() -> pd.DataFrame:
+    orders = _fetch_orders(
+        {
+            "status": "any",
+            "created_at_min": get_last_friday_4pm(),
+            "limit": ORDERS_PAGE_LIMIT,
+        }
+    )
 
     data = []
     for order in orders:
@@ -72,77 +168,56 @@ def get_last_6_days_orders() -> pd.DataFrame:
 def get_last_6_days_orders_with_variants(
     start_date: datetime | None = None, end_date: datetime | None = None
 ) -> pd.DataFrame:
-    url = f"https://{SHOP_NAME}.myshopify.com/admin/api/{API_VERSION}/orders.json"
-
     if start_date is None:
         start_date_str = get_last_friday_4pm()
     else:
         start_date_str = start_date.isoformat()
 
-    params = {"status": "any", "created_at_min": start_date_str, "limit": 250}
+    params = {
+        "status": "any",
+        "created_at_min": start_date_str,
+        "limit": ORDERS_PAGE_LIMIT,
+    }
 
     if end_date is not None:
         end_date_str = end_date.isoformat()
         params["created_at_max"] = end_date_str
 
-    headers = {
-        "X-Shopify-Access-Token": ACCESS_TOKEN,
-        "Content-Type": "application/json",
-    }
-
-    orders = []
-    next_page_info: str | None = None
-    while True:
-        response = requests.get(url, headers=headers, params=params)
-
-        if response.status_code != 200:
-            raise Exception(
-                f"Error fetching orders: {response.status_code} - {response.text}"
-            )
-
-        orders.extend(response.json().get("orders", []))
-
-        link_header = response.headers.get("Link")
-        if not link_header:
-            break
-        parsed_links = parse_header_links(link_header.rstrip(">").replace(">,", ">, "))
-        next_link = next(
-            (link for link in parsed_links if link.get("rel") == "next"), None
-        )
-        if not next_link or not next_link.get("url"):
-            break
-        query = parse_qs(urlparse(next_link["url"]).query)
-        next_page_info = query.get("page_info", [None])[0]
-        if not next_page_info:
-            break
-        params = {"limit": 250, "page_info": next_page_info}
-
-    data = []
-    for order in orders:
-        created_at = datetime.fromisoformat(
-            order.get("created_at").replace("Z", "+00:00")
-        )
-        formatted_date = created_at.strftime("%d.%m.%Y %H:%M")
-        customer_name = f"{order.get('customer', {}).get('first_name', '')} {order.get('customer', {}).get('last_name', '')}".strip()
-        for item in order.get("line_items", []):
-            data.append(
-                {
-                    "Order ID": order.get("id"),
-                    "Customer": customer_name,
-                    "Wann bestellt": formatted_date,
-                    "Product Title": item.get("title"),
-                    "Variant Title": item.get("variant_title"),
-                    "Variant ID": item.get("variant_id"),
-                    "SKU": item.get("sku"),
-                    "Quantity": item.get("quantity"),
-                    "Price Per Item": float(item.get("price")),
-                    "Total Order Price": float(order.get("total_price", 0.0)),
-                    "Financial Status": order.get("financial_status"),
-                    "Fulfillment Status": order.get("fulfillment_status"),
-                }
-            )
-
-    return pd.DataFrame(data)
+    orders = _fetch_orders(params)
+    orders = [order for order in orders if order.get("line_items")]
+    if not orders:
+        return pd.DataFrame()
+
+    items = pd.json_normalize(
+        orders,
+        record_path="line_items",
+        meta=ORDER_META,
+        meta_prefix="order.",
+        errors="ignore",
+    ).reindex(columns=[*LINE_ITEM_COLUMNS, *ORDER_META_COLUMNS])
+
+    customer = (
+        items["order.customer.first_name"].fillna("")
+        + " "
+        + items["order.customer.last_name"].fillna("")
+    ).str.strip()
+
+    return pd.DataFrame(
+        {
+            "Order ID": pd.to_numeric(items["order.id"]),
+            "Customer": customer,
+            "Wann bestellt": format_created_at(items["order.created_at"]),
+            "Product Title": items["title"],
+            "Variant Title": items["variant_title"],
+            "Variant ID": items["variant_id"],
+            "SKU": items["sku"],
+            "Quantity": items["quantity"],
+            "Price Per Item": items["price"].astype(float),
+            "Total Order Price": pd.to_numeric(items["order.total_price"]).fillna(0.0),
+            "Financial Status": items["order.financial_status"],
+            "Fulfillment Status": items["order.fulfillment_status"],
+        }
+    )
 
 
 def get_heidelberg_weather() -> dict:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 from dataclasses import dataclass
 from typing import Any, Callable
@@ -21,7 +22,11 @@ from src.liefernscheine_prompt_config import (
     LieferscheinePayload,
     validate_lieferscheine_payload_with_report,
 )
-from src.order_prompt_config import OrdersPayload, validate_orders_payload_with_report
+from src.order_prompt_config import (
+    OrderItem,
+    OrdersPayload,
+    validate_orders_payload_with_report,
+)
 
 
 class StructuredExtractionError(RuntimeError):
@@ -29,9 +34,11 @@ class StructuredExtractionError(RuntimeError):
 
 
 NormalizerFn = Callable[[dict[str, Any], dict[str, Any]], tuple[dict[str, Any], dict[str, Any]]]
+ItemCallback = Callable[[dict[str, Any]], None]
 ExtractionPattern = str
 
 PATTERN_TOOL_CALL_REPAIR: ExtractionPattern = "tool_call_repair"
+PATTERN_JSON_SCHEMA_STRICT: ExtractionPattern = "json_schema_strict"
 # Placeholder patterns for future evolution:
 PATTERN_JSON_MODE_ONCE: ExtractionPattern = "json_mode_once"
 # PATTERN_RESPONSES_PARSE: ExtractionPattern = "responses_parse"
@@ -47,13 +54,40 @@ class ExtractionTarget:
     normalize: NormalizerFn
 
 
+@functools.lru_cache(maxsize=1)
+def _order_field_defaults() -> dict[str, Any]:
+    defaults: dict[str, Any] = {}
+    for name, field in OrderItem.model_fields.items():
+        if not field.is_required() and field.default is not None:
+            defaults[field.alias or name] = field.default
+    return defaults
+
+
+def _fill_order_defaults(payload: dict[str, Any]) -> dict[str, Any]:
+    # Strict structured outputs send every key, so missing values arrive as
+    # explicit nulls; map them back to the OrderItem field defaults.
+    orders = payload.get("orders")
+    if not isinstance(orders, list):
+        return payload
+    defaults = _order_field_defaults()
+    filled: list[Any] = []
+    for row in orders:
+        if isinstance(row, dict):
+            row = dict(row)
+            for alias, default in defaults.items():
+                if row.get(alias) is None:
+                    row[alias] = default
+        filled.append(row)
+    return {**payload, "orders": filled}
+
+
 def _normalize_orders(
     payload: dict[str, Any],
     context: dict[str, Any],
 ) -> tuple[dict[str, Any], dict[str, Any]]:
     default_eintragender = str(context.get("default_eintragender", "")).strip()
     return validate_orders_payload_with_report(
-        payload,
+        _fill_order_defaults(payload),
         default_eintragender=default_eintragender,
     )
 
@@ -93,7 +127,7 @@ def _normalize_u1_page(
 EXTRACTION_TARGETS: dict[str, ExtractionTarget] = {
     "orders_v1": ExtractionTarget(
         key="orders_v1",
-        pattern=PATTERN_TOOL_CALL_REPAIR,
+        pattern=PATTERN_JSON_SCHEMA_STRICT,
         function_name="extract_orders_v1",
         description="Extract bakery orders from text/image into the orders payload schema.",
         model=OrdersPayload,
@@ -150,11 +184,61 @@ def _build_tools(target: ExtractionTarget) -> list[dict[str, Any]]:
     ]
 
 
-def get_tools_for_target(target_key: str) -> list[dict[str, Any]]:
+def _strict_json_schema(schema: Any) -> Any:
+    # Strict structured outputs require closed objects where every property is
+    # listed as required; the model sends null for missing values and the target
+    # normalizer maps those back to the field defaults.
+    if isinstance(schema, list):
+        return [_strict_json_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    strict = {
+        key: _strict_json_schema(value) for key, value in schema.items() if key != "default"
+    }
+    properties = strict.get("properties")
+    if strict.get("type") == "object" and isinstance(properties, dict):
+        strict["required"] = list(properties.keys())
+        strict["additionalProperties"] = False
+    return strict
+
+
+def _build_response_format(target: ExtractionTarget) -> dict[str, Any]:
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": target.function_name,
+            "description": target.description,
+            "schema": _strict_json_schema(target.model.model_json_schema(by_alias=True)),
+            "strict": True,
+        },
+    }
+
+
+def _get_target(target_key: str) -> ExtractionTarget:
     target = EXTRACTION_TARGETS.get(target_key)
     if target is None:
         raise StructuredExtractionError(f"Unknown extraction target: {target_key}")
-    return _build_tools(target)
+    return target
+
+
+def get_tools_for_target(target_key: str) -> list[dict[str, Any]]:
+    return _build_tools(_get_target(target_key))
+
+
+def get_response_format_for_target(target_key: str) -> dict[str, Any]:
+    return _build_response_format(_get_target(target_key))
+
+
+def _request_options(target: ExtractionTarget) -> dict[str, Any]:
+    if target.pattern == PATTERN_JSON_SCHEMA_STRICT:
+        return {"response_format": _build_response_format(target)}
+    return {
+        "tools": _build_tools(target),
+        "tool_choice": {
+            "type": "function",
+            "function": {"name": target.function_name},
+        },
+    }
 
 
 def _extract_arguments(response: Any) -> str:
@@ -171,6 +255,60 @@ def _extract_arguments(response: Any) -> str:
     return "{}"
 
 
+class _StreamedItemScanner:
+    """Emit each object of the payload's top-level array once it is complete."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: int | None = None
+
+    def feed(self, chunk: str) -> list[str]:
+        items: list[str] = []
+        offset = len(self.text)
+        self.text += chunk
+        for index, char in enumerate(chunk, start=offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 3 and char == "{":
+                    self._item_start = index
+            elif char in "}]":
+                if self._depth == 3 and char == "}" and self._item_start is not None:
+                    items.append(self.text[self._item_start : index + 1])
+                    self._item_start = None
+                self._depth -= 1
+        return items
+
+
+def _stream_content(response: Any, on_item: ItemCallback) -> str:
+    scanner = _StreamedItemScanner()
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = getattr(chunk.choices[0].delta, "content", None)
+        if not delta:
+            continue
+        for raw_item in scanner.feed(delta):
+            try:
+                item = json.loads(raw_item)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(item, dict):
+                on_item(item)
+    return scanner.text or "{}"
+
+
 def _json_error_message(raw_args: str, error: ValidationError) -> str:
     return (
         "The following JSON failed schema validation.\n\n"
@@ -193,17 +331,16 @@ def extract_with_repair(
     context: dict[str, Any] | None = None,
     max_retries: int = 2,
     temperature: float = 0,
+    on_item: ItemCallback | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
-    target = EXTRACTION_TARGETS.get(target_key)
-    if target is None:
-        raise StructuredExtractionError(f"Unknown extraction target: {target_key}")
-    if target.pattern != PATTERN_TOOL_CALL_REPAIR:
+    target = _get_target(target_key)
+    if target.pattern not in (PATTERN_TOOL_CALL_REPAIR, PATTERN_JSON_SCHEMA_STRICT):
         raise StructuredExtractionError(
             f"Unsupported extraction pattern for target {target_key}: {target.pattern}"
         )
 
     context = context or {}
-    tools = _build_tools(target)
+    request_options = _request_options(target)
     messages: list[dict[str, Any]] = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_content},
@@ -213,17 +350,18 @@ def extract_with_repair(
     last_raw_args = "{}"
 
     for attempt in range(max_retries + 1):
+        # Only the first strict attempt is streamed; repair rounds would re-emit
+        # items the caller has already rendered.
+        stream = on_item is not None and attempt == 0
+        stream = stream and target.pattern == PATTERN_JSON_SCHEMA_STRICT
         response = client.chat.completions.create(
             model=model_name,
             temperature=temperature,
             messages=messages,
-            tools=tools,
-            tool_choice={
-                "type": "function",
-                "function": {"name": target.function_name},
-            },
+            stream=stream,
+            **request_options,
         )
-        raw_args = _extract_arguments(response)
+        raw_args = _stream_content(response, on_item) if stream else _extract_arguments(response)
         last_raw_args = raw_args
 
         try:
@@ -242,6 +380,13 @@ def extract_with_repair(
                 break
             messages.append({"role": "user", "content": _json_error_message(raw_args, error)})
 
+    if target.pattern == PATTERN_JSON_SCHEMA_STRICT:
+        # Strict mode guarantees a single schema-shaped object, so there is
+        # nothing left to salvage locally.
+        raise StructuredExtractionError(
+            f"Extraction failed for target {target_key} after {max_retries + 1} attempts"
+        ) from last_error
+
     # Fallback: try to salvage with local normalization before failing hard.
     try:
         fallback_payload = json.loads(last_raw_args)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "scripts" / "evaluate_datev.py"
+SPEC = importlib.util.spec_from_file_location("evaluate_datev", SCRIPT_PATH)
+assert SPEC and SPEC.loader
+MODULE = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+evaluate = MODULE.evaluate
+format_cents = MODULE.format_cents
+money_to_cents = MODULE.money_to_cents
+read_extf = MODULE.read_extf
+
+BOOKING_HEADER = [
+    "Umsatz",
+    "Soll-/Haben-Kennzeichen",
+    "Konto",
+    "Gegenkonto (ohne BU-Schlüssel)",
+    "BU-Schlüssel",
+    "Belegdatum",
+    "Buchungstext",
+    "Beleginfo-Art 1",
+    "Beleginfo-Inhalt 1",
+    "Beleginfo-Art 2",
+    "Beleginfo-Inhalt 2",
+    "EU-Mitgliedstaat u. UStID (Bestimmung)",
+    "EU-Steuersatz (Bestimmung)",
+]
+
+
+def _write_extf(path: Path, kind: str, header: list[str], rows: list[list[str]]) -> Path:
+    lines = [f'"EXTF";700;21;"{kind}"', ";".join(f'"{name}"' for name in header)]
+    lines.extend(";".join(row) for row in rows)
+    path.write_bytes(("\r\n".join(lines) + "\r\n").encode("cp1252"))
+    return path
+
+
+def _fixture(tmp_path: Path):
+    bookings = _write_extf(
+        tmp_path / "EXTF_Buchungsstapel_test.csv",
+        "Buchungsstapel",
+        BOOKING_HEADER,
+        [
+            ["1.234,50", '"S"', "10001", "8400", '"2222"', "0503", '"Rechnung"', '"Name"', '"Müller GmbH"', "", "", '"NL 123"', "0"],
+            ["10,00", '"H"', "1200", "4970", "", "0603", '"PayPal Fee"', '"Ref"', '"x"', '"Name"', '"Bank"', "", ""],
+            ["5,25", '"H"', "10002", "8125", '"1111"', "1x03", "", "", "", "", "", '"de999"', "0"],
+            [";" * (len(BOOKING_HEADER) - 1)],
+        ],
+    )
+    master = _write_extf(
+        tmp_path / "EXTF_GP_Stamm_test.csv",
+        "Debitoren/Kreditoren",
+        [
+            "Konto",
+            "Name (Adressatentyp Unternehmen)",
+            "Name (Adressatentyp natürl. Person)",
+            "Vorname (Adressatentyp natürl. Person)",
+        ],
+        [["10001", '"Müller GmbH"', "", ""], ["10003", "", '"Meier"', '"Jörg"']],
+    )
+    return read_extf(bookings, "cp1252"), read_extf(master, "cp1252")
+
+
+def test_money_to_cents_parses_datev_amounts() -> None:
+    raw = pd.Series(["1.234,50", "-5,5", "0,07", "", "n/a"])
+
+    assert money_to_cents(raw).tolist() == [123450, -550, 7, 0, 0]
+    assert [format_cents(value) for value in (123450, -550, 7, 0)] == ["1234.50", "-5.50", "0.07", "0.00"]
+
+
+def test_read_extf_splits_meta_and_drops_blank_rows(tmp_path: Path) -> None:
+    bookings, _ = _fixture(tmp_path)
+
+    assert bookings.meta[3] == "Buchungsstapel"
+    assert bookings.header == BOOKING_HEADER
+    assert len(bookings.frame) == 3
+
+    narrowed = read_extf(bookings.path, "cp1252", frozenset({"Umsatz", "Konto"}))
+    assert narrowed.header == ["Umsatz", "Konto"]
+    assert len(narrowed.frame) == 3
+
+    # Blank rows are judged on the full row, not only on the requested columns.
+    sparse = read_extf(bookings.path, "cp1252", frozenset({"EU-Steuersatz (Bestimmung)"}))
+    assert sparse.frame["EU-Steuersatz (Bestimmung)"].tolist() == ["0", "", "0"]
+
+
+def test_evaluate_totals_igl_and_extract(tmp_path: Path) -> None:
+    bookings, master = _fixture(tmp_path)
+
+    result = evaluate(
+        bookings=bookings,
+        master=master,
+        top_n=5,
+        igl_bu_keys={"2222"},
+        extract_bu_keys={"1111", "2222"},
+        plots_dir=tmp_path / "plots",
+        write_extracted_csv=False,
+    )
+
+    summary = result["bookings"]
+    assert summary["debit_S_total"] == "1234.50"
+    assert summary["credit_H_total"] == "15.25"
+    assert summary["net_S_minus_H"] == "1219.25"
+    assert summary["top_month_mm"] == [("03", 2)]
+    assert summary["fee_like_rows"] == 1
+    assert summary["top_names_in_beleginfo"] == [("Müller GmbH", 1), ("Bank", 1)]
+
+    assert result["master_data"]["sample_names"] == ["Müller GmbH", "Jörg Meier"]
+    assert result["crosscheck"]["booking_accounts_found_in_master"] == 1
+
+    igl = result["innergemeinschaftliche_lieferungen"]
+    assert igl["strict_with_bu_key"]["rows"] == 1
+    assert igl["strict_with_bu_key"]["top_country_prefix"] == [("NL", 1)]
+
+    extract = result["bu_key_extract"]
+    assert extract["rows"] == 2
+    assert extract["net_S_minus_H"] == "1229.25"
+    assert extract["top_partner_names"] == [("Müller GmbH", 1)]
+    assert extract["plots"] == []
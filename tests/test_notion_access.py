@@ -0,0 +1,45 @@
+import json
+from types import SimpleNamespace
+
+from src import notion_access
+
+
+def _response(status_code: int, body: dict | None = None, headers: dict | None = None):
+    text = json.dumps(body or {})
+    return SimpleNamespace(
+        status_code=status_code,
+        ok=status_code < 400,
+        headers=headers or {},
+        text=text,
+        json=lambda: json.loads(text),
+    )
+
+
+def test_insert_orders_retries_429_and_reports_failed_orders(monkeypatch):
+    monkeypatch.setenv("NOTION_TOKEN", "secret")
+    monkeypatch.setattr(notion_access.time, "sleep", lambda seconds: None)
+    calls: list[str] = []
+
+    def fake_request(method, url, headers=None, json=None, timeout=None):
+        produkt = json["properties"]["Produkt"]["title"][0]["text"]["content"]
+        calls.append(produkt)
+        if produkt == "Rustico" and calls.count("Rustico") == 1:
+            return _response(429, headers={"Retry-After": "0"})
+        if produkt == "Baguette":
+            return _response(400, {"message": "invalid"})
+        return _response(200, {"id": "page"})
+
+    monkeypatch.setattr(notion_access.requests, "request", fake_request)
+    orders = [
+        {"Menge": 1, "Produkt": "Rustico"},
+        {"Menge": 2, "Produkt": "Baguette"},
+        {"Menge": 3, "Produkt": "Classico"},
+    ]
+
+    result = notion_access.insert_orders("db", orders)
+
+    assert result.created == 2
+    assert [index for index, _ in result.failed] == [1]
+    assert calls.count("Rustico") == 2
+    assert calls.count("Classico") == 1
+    assert "Bestellung 2 (2 Baguette)" in notion_access.describe_failed_orders(orders, result.failed)
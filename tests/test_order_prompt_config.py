@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import pandas as pd
+
+from src.order_prompt_config import order_datum_column, validate_orders_payload
+
+
+def test_order_datum_column_keeps_local_wall_time():
+    orders = [
+        {"Datum": "2026-06-01T10:00:00+02:00"},
+        {"Datum": "2026-06-01T08:00:00Z"},
+        {"Datum": "2026-06-01T10:00:00.750"},
+        {"Datum": datetime(2026, 1, 5, 9, 30)},
+        {"Datum": ""},
+        {},
+    ]
+
+    datum = order_datum_column(orders)
+
+    assert datum.tolist()[:4] == [
+        pd.Timestamp("2026-06-01 10:00:00"),
+        pd.Timestamp("2026-06-01 10:00:00"),
+        pd.Timestamp("2026-06-01 10:00:00"),
+        pd.Timestamp("2026-01-05 09:30:00"),
+    ]
+    assert datum.iloc[4:].isna().all()
+
+
+def test_validate_orders_payload_keeps_cleared_optional_fields():
+    payload = {"orders": [{"Menge": 1, "Produkt": "Rustico", "Wohin": None, "Zahlung": None}]}
+
+    order = validate_orders_payload(payload)["orders"][0]
+
+    assert order["Wohin"] is None
+    assert order["Zahlung"] is None
@@ -1,15 +1,21 @@
 from datetime import time
 
-import pytest
 import pandas as pd
+import pytest
 
+from src import schichtplan_utils
 from src.schichtplan_utils import (
     _prepare_availability_dataframe,
+    dedupe_person_info,
     detect_availability_time_columns,
+    fill_missing_end_times,
     generate_fixed_schedule_entries,
     generate_schichtplan,
+    match_names,
     normalize_fixed_schedule_records,
+    normalize_long_shifts,
     parse_wann,
+    split_multiday_entries,
     transform_to_schedule_format,
 )
 
@@ -291,3 +297,93 @@ def test_generate_schichtplan_falls_back_to_11_16_for_non_fixed_without_explicit
 
     export = pd.read_csv(output_files["export"])
     assert export.loc[0, "Date"] == "2026-06-04 11:00 → 2026-06-04 16:00"
+
+
+def test_fill_missing_end_times_uses_end_of_start_day():
+    df = pd.DataFrame(
+        {
+            "Start Time": [pd.Timestamp("2026-06-04 09:00"), pd.Timestamp("2026-06-05 10:00")],
+            "End Time": [pd.NaT, pd.Timestamp("2026-06-05 12:00")],
+        }
+    )
+
+    filled = fill_missing_end_times(df)
+
+    assert filled["End Time"].tolist() == [
+        pd.Timestamp("2026-06-04 23:59:59"),
+        pd.Timestamp("2026-06-05 12:00"),
+    ]
+    assert filled is df
+
+
+def test_normalize_long_shifts_resets_only_overlong_shifts():
+    df = pd.DataFrame(
+        {
+            "Start Time": [pd.Timestamp("2026-06-04 06:00"), pd.Timestamp("2026-06-05 09:00")],
+            "End Time": [pd.Timestamp("2026-06-04 22:00"), pd.Timestamp("2026-06-05 17:00")],
+        }
+    )
+
+    normalized = normalize_long_shifts(df)
+
+    assert normalized["Start Time"].tolist() == [
+        pd.Timestamp("2026-06-04 10:00"),
+        pd.Timestamp("2026-06-05 09:00"),
+    ]
+    assert normalized["End Time"].tolist() == [
+        pd.Timestamp("2026-06-04 18:00"),
+        pd.Timestamp("2026-06-05 17:00"),
+    ]
+
+
+def test_split_multiday_entries_keeps_original_start_and_end_on_outer_days():
+    df = pd.DataFrame(
+        {
+            "Name": ["Maya", "Jaime"],
+            "Start Time": [pd.Timestamp("2026-06-01 09:00"), pd.Timestamp("2026-06-02 10:00")],
+            "End Time": [pd.Timestamp("2026-06-03 12:00"), pd.NaT],
+        }
+    )
+
+    split = split_multiday_entries(df).reset_index(drop=True)
+
+    assert split["Name"].tolist() == ["Maya", "Maya", "Maya", "Jaime"]
+    assert split["Start Time"].tolist() == [
+        pd.Timestamp("2026-06-01 09:00"),
+        pd.Timestamp("2026-06-02 00:00"),
+        pd.Timestamp("2026-06-03 00:00"),
+        pd.Timestamp("2026-06-02 10:00"),
+    ]
+    assert split["End Time"].tolist()[:3] == [
+        pd.Timestamp("2026-06-01 23:59:59"),
+        pd.Timestamp("2026-06-02 23:59:59"),
+        pd.Timestamp("2026-06-03 12:00"),
+    ]
+    assert pd.isna(split.loc[3, "End Time"])
+
+
+def test_match_names_maps_each_distinct_name_once():
+    matches = match_names(["Jamie", " Jamie ", "Lenard", "Xyz", None], ["Jaime", "Lennard", "Maya"])
+
+    assert matches == {"Jamie": "Jaime", "Lenard": "Lennard", "Xyz": None}
+
+
+def test_match_names_difflib_fallback_without_rapidfuzz(monkeypatch):
+    monkeypatch.setattr(schichtplan_utils, "process", None)
+
+    matches = match_names(["Jamie", "Lenard", "Xyz"], ["Jaime", "Lennard", "Maya"])
+
+    assert matches == {"Jamie": "Jaime", "Lenard": "Lennard", "Xyz": None}
+
+
+def test_dedupe_person_info_keeps_first_entry_per_name():
+    person_info = [
+        ("Arne", "ALT", "Service"),
+        ("Maya", "WIE", "Bar"),
+        ("Arne", "BAK", "Backen"),
+    ]
+
+    assert dedupe_person_info(person_info) == [
+        ("Arne", "ALT", "Service"),
+        ("Maya", "WIE", "Bar"),
+    ]
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from src import shopify_access
+
+
+class _FakeSession:
+    def __init__(self, pages: list[tuple[list[dict], str | None]]):
+        self._pages = list(pages)
+        self.calls: list[dict] = []
+
+    def get(self, url, params=None):
+        self.calls.append(dict(params))
+        orders, link = self._pages.pop(0)
+        headers = {"Link": link} if link else {}
+        return SimpleNamespace(
+            status_code=200, headers=headers, json=lambda: {"orders": orders}
+        )
+
+
+def _order(order_id: int, title: str) -> dict:
+    return {
+        "id": order_id,
+        "created_at": "2024-05-03T16:30:00Z",
+        "total_price": "12.50",
+        "financial_status": "paid",
+        "fulfillment_status": None,
+        "customer": {"first_name": "Anna", "last_name": "Beck"},
+        "line_items": [
+            {"title": title, "variant_title": "1 kg", "quantity": 2, "price": "6.25"}
+        ],
+    }
+
+
+def test_orders_follow_link_pagination(monkeypatch):
+    next_link = (
+        '<https://suedseitecoffee.myshopify.com/admin/api/2024-01/orders.json'
+        '?limit=250&page_info=abc>; rel="next"'
+    )
+    session = _FakeSession([([_order(1, "Unsere Brote")], next_link), ([_order(2, "Kaffee")], None)])
+    monkeypatch.setattr(shopify_access, "_shopify_session", lambda: session)
+
+    df = shopify_access.get_last_6_days_orders_with_variants()
+
+    assert df["Order ID"].tolist() == [1, 2]
+    assert df["Product Title"].tolist() == ["Unsere Brote", "Kaffee"]
+    assert df["Customer"].tolist() == ["Anna Beck", "Anna Beck"]
+    assert df["Wann bestellt"].tolist() == ["03.05.2024 16:30", "03.05.2024 16:30"]
+    assert df["Price Per Item"].tolist() == [6.25, 6.25]
+    assert session.calls[1] == {"limit": 250, "page_info": "abc"}
@@ -0,0 +1,139 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.structured_extraction import (
+    StructuredExtractionError,
+    extract_with_repair,
+    get_response_format_for_target,
+)
+
+
+class _FakeCompletions:
+    def __init__(self, contents: list[str]):
+        self._contents = list(contents)
+        self.calls: list[dict] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(tool_calls=None, content=self._contents.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client(contents: list[str]) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(contents)))
+
+
+def test_orders_response_format_is_strict_and_closed():
+    response_format = get_response_format_for_target("orders_v1")
+
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    schema = response_format["json_schema"]["schema"]
+    assert schema["additionalProperties"] is False
+    assert schema["required"] == ["orders"]
+    order_item = schema["$defs"]["OrderItem"]
+    assert order_item["additionalProperties"] is False
+    assert set(order_item["required"]) == set(order_item["properties"])
+    assert "default" not in json.dumps(schema)
+
+
+def test_orders_extraction_uses_response_format_instead_of_tools():
+    payload = {"orders": [{"Menge": 2, "Produkt": "Rustico", "Eintragender": None}]}
+    client = _fake_client([json.dumps(payload)])
+
+    parsed, trace = extract_with_repair(
+        client=client,
+        model_name="gpt-4o-mini",
+        system_prompt="system",
+        user_content="user",
+        target_key="orders_v1",
+        context={"default_eintragender": "Anna"},
+    )
+
+    call = client.chat.completions.calls[0]
+    assert "tools" not in call
+    assert call["response_format"]["type"] == "json_schema"
+    assert parsed["orders"][0]["Eintragender"] == "Anna"
+    assert trace["attempts"] == 1
+
+
+def test_orders_extraction_fills_defaults_for_explicit_nulls():
+    order = {
+        "Notiz/Kunde": None,
+        "Abgeholt": "Nein",
+        "Datum": None,
+        "Menge": 1,
+        "Produkt": "Rustico",
+        "Eintragender": None,
+        "Wohin": None,
+        "Zahlung": None,
+    }
+    client = _fake_client([json.dumps({"orders": [order]})])
+
+    parsed, _ = extract_with_repair(
+        client=client,
+        model_name="gpt-4o-mini",
+        system_prompt="system",
+        user_content="user",
+        target_key="orders_v1",
+    )
+
+    saved = parsed["orders"][0]
+    assert saved["Wohin"] == "Wieblingen"
+    assert saved["Zahlung"] == "Vor Ort"
+    assert saved["Notiz/Kunde"] is None
+
+
+def test_orders_extraction_raises_without_local_salvage():
+    client = _fake_client(['{"orders": "x"}'] * 3)
+
+    with pytest.raises(StructuredExtractionError):
+        extract_with_repair(
+            client=client,
+            model_name="gpt-4o-mini",
+            system_prompt="system",
+            user_content="user",
+            target_key="orders_v1",
+        )
+
+
+class _FakeStreamingCompletions(_FakeCompletions):
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self._contents.pop(0)
+        if not kwargs.get("stream"):
+            message = SimpleNamespace(tool_calls=None, content=content)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        deltas = [content[i : i + 7] for i in range(0, len(content), 7)]
+        return [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+            for delta in deltas
+        ]
+
+
+def test_orders_extraction_streams_completed_items():
+    payload = {
+        "orders": [
+            {"Menge": 1, "Produkt": "Rustico", "Notiz/Kunde": "Tisch {3}, \"Ecke\""},
+            {"Menge": 4, "Produkt": "Classico"},
+        ]
+    }
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=_FakeStreamingCompletions([json.dumps(payload)]))
+    )
+    streamed: list[dict] = []
+
+    parsed, _ = extract_with_repair(
+        client=client,
+        model_name="gpt-4o-mini",
+        system_prompt="system",
+        user_content="user",
+        target_key="orders_v1",
+        on_item=streamed.append,
+    )
+
+    assert client.chat.completions.calls[0]["stream"] is True
+    assert streamed == payload["orders"]
+    assert [order["Produkt"] for order in parsed["orders"]] == ["Rustico", "Classico"]